@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.contrib.auth.models import Group
 
+from config.admin_search import IndexedSearchMixin
+
 from .models import (
     BUSINESS_USERS_GROUP,
     REGULAR_USERS_GROUP,
@@ -30,7 +32,7 @@ def assign_business_users(modeladmin, request, queryset):
 
 
 @admin.register(User)
-class UserAdmin(DjangoUserAdmin):
+class UserAdmin(IndexedSearchMixin, DjangoUserAdmin):
     model = User
     ordering = ("-date_joined",)
     list_display = ("phone", "email", "is_staff", "is_superuser", "is_active", "user_groups")
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:42
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+from config.db_operations import CreateExtensionIfAvailable, PostgresAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_seed_default_user_groups"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        CreateExtensionIfAvailable("pg_trgm"),
+        PostgresAddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("phone"), name="gin_trgm_ops"
+                ),
+                name="accounts_user_phone_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+        PostgresAddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="accounts_user_email_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+        PostgresAddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="accounts_user_first_name_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+        PostgresAddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="accounts_user_last_name_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+    ]
@@ -1,6 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db.models import Q
-from django.db.models.functions import Lower
+from django.db.models.functions import Lower, Upper
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager, Group
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils import timezone
@@ -34,6 +35,11 @@ class User(AbstractBaseUser, PermissionsMixin):
                 name="accounts_user_email_ci_unique",
             )
         ]
+        # Trigram indexes on UPPER(col) serve the admin's icontains (UPPER(col) LIKE '%x%') search.
+        indexes = [
+            GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=f"accounts_user_{field}_trgm")
+            for field in ("phone", "email", "first_name", "last_name")
+        ]
 
     phone = models.CharField(max_length=32, unique=True, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
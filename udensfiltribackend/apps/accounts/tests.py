@@ -122,6 +122,19 @@ class AuthFlowTests(TestCase):
         )
         self.assertEqual(relogin.status_code, 200)
 
+    def test_me_supports_conditional_get(self):
+        User.objects.create_user(phone=None, email="etag@example.com", password="StrongPass123")
+        self._login("etag@example.com", "StrongPass123")
+        r = self.client.get("/api/auth/me/")
+        self.assertEqual(r.status_code, 200)
+        r2 = self.client.get("/api/auth/me/", HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r2.status_code, 304)
+
+        self.client.patch("/api/auth/profile/", {"first_name": "Anna"}, format="json")
+        r3 = self.client.get("/api/auth/me/", HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r3.status_code, 200)
+        self.assertEqual(r3.data["user"]["first_name"], "Anna")
+
 
 class SendGridSettingsTests(TestCase):
     @override_settings(SENDGRID_API_KEY="SG.key", EMAIL_BACKEND="config.email_backends.SendGridEmailBackend")
@@ -11,6 +11,8 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 
+from config.conditional import make_etag, not_modified, set_validators
+
 from .auth import clear_auth_cookies, set_auth_cookies
 from .models import EmailCode, User
 from .serializers import (
@@ -148,7 +150,12 @@ def logout(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def me(request):
-    return Response({"user": UserSerializer(request.user).data})
+    user = request.user
+    etag = make_etag("me", user.pk, user.phone, user.email, user.first_name, user.last_name)
+    resp = not_modified(request, etag=etag)
+    if resp is not None:
+        return resp
+    return set_validators(Response({"user": UserSerializer(user).data}), etag)
 
 
 @api_view(["PATCH"])
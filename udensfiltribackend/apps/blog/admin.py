@@ -3,7 +3,8 @@ from .models import Post
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display=("title","status","published_at","updated_at")
+    list_display=("title","status","published_at","reading_time_minutes","updated_at")
+    readonly_fields=("word_count","reading_time_minutes")
     list_filter=("status",)
     search_fields=("title","slug","excerpt")
     prepopulated_fields={"slug":("title",)}
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.blog.models import RENDERED_FIELDS, Post
+from config.cache import bump_generation
+
+
+class Command(BaseCommand):
+    help = "Render post bodies to HTML, table of contents, word count and reading time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", dest="rerender", help="Re-render every post, not only unrendered ones")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, rerender=False, batch_size=200, **options):
+        qs = Post.objects.only("id", "body", *RENDERED_FIELDS).order_by("id")
+        if not rerender:
+            qs = qs.filter(body_html="").exclude(body="")
+        count = 0
+        batch = []
+        with transaction.atomic():
+            for post in qs.iterator(chunk_size=batch_size):
+                post.render()
+                batch.append(post)
+                if len(batch) >= batch_size:
+                    count += Post.objects.bulk_update(batch, RENDERED_FIELDS)
+                    batch = []
+            count += Post.objects.bulk_update(batch, RENDERED_FIELDS)
+            # bulk_update sends no signals.
+            if count:
+                bump_generation(Post)
+        self.stdout.write(self.style.SUCCESS(f"Rendered {count} posts"))
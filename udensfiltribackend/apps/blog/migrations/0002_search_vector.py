@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from config.db_operations import PostgresAddIndex
+from config.search import update_search_vector
+
+
+SEARCH_FIELDS = (
+    ("Post", (("title", "A"), ("excerpt", "B"), ("body", "C"))),
+)
+
+
+def populate_search_vectors(apps, schema_editor):
+    for model_name, weighted_fields in SEARCH_FIELDS:
+        update_search_vector(apps.get_model("blog", model_name).objects.all(), weighted_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="blog_post_search_gin"
+            ),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:10
+
+import math
+
+from django.db import migrations, models
+
+
+# Frozen copy of the helper this migration was written against, so it no
+# longer depends on runtime app code.
+def reading_time(text):
+    words = len(text.split())
+    return math.ceil(words / 200) if words else 0
+
+
+def populate_reading_time(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    batch = []
+    for post in Post.objects.only("id", "body").iterator(chunk_size=500):
+        post.reading_time_minutes = reading_time(post.body)
+        batch.append(post)
+        if len(batch) == 500:
+            Post.objects.bulk_update(batch, ["reading_time_minutes"])
+            batch = []
+    Post.objects.bulk_update(batch, ["reading_time_minutes"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="reading_time_minutes",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_reading_time, migrations.RunPython.noop),
+    ]
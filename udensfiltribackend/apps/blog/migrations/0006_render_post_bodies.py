@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:05
+
+import html
+import math
+
+import markdown
+import nh3
+from django.db import migrations
+from django.utils.html import strip_tags
+
+# Frozen copy of apps.blog.rendering as of this migration, so later changes to
+# the runtime renderer cannot change what this backfill writes.
+WORDS_PER_MINUTE = 200
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+ALLOWED_ATTRIBUTES = {
+    **{tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()},
+    **{tag: {"id"} for tag in HEADINGS},
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "code": {"class"},
+    "th": {"style"},
+    "td": {"style"},
+}
+BATCH_SIZE = 200
+
+
+def _toc(tokens):
+    return [
+        {"id": t["id"], "title": html.unescape(t["name"]), "level": t["level"], "children": _toc(t["children"])}
+        for t in tokens
+    ]
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    fields = ["body_html", "toc", "word_count", "reading_time_minutes"]
+    batch = []
+    for post in Post.objects.only("id", "body").order_by("id").iterator(chunk_size=BATCH_SIZE):
+        md = markdown.Markdown(extensions=["toc", "tables", "fenced_code", "sane_lists"])
+        post.body_html = nh3.clean(
+            md.convert(post.body or ""),
+            attributes=ALLOWED_ATTRIBUTES,
+            url_schemes={"http", "https", "mailto"},
+            filter_style_properties={"text-align"},
+        )
+        post.toc = _toc(md.toc_tokens)
+        post.word_count = len(html.unescape(strip_tags(post.body_html)).split())
+        post.reading_time_minutes = math.ceil(post.word_count / WORDS_PER_MINUTE) if post.word_count else 0
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            Post.objects.bulk_update(batch, fields)
+            batch = []
+    Post.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_post_rendered_body"),
+    ]
+
+    operations = [
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,16 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 
+from .rendering import render_body
+
+# Columns derived from ``body`` by render_body() on save.
+RENDERED_FIELDS = ("body_html", "toc", "word_count", "reading_time_minutes")
+
 class Post(models.Model):
     STATUS=[("draft","draft"),("published","published")]
+    SEARCH_FIELDS = (("title", "A"), ("excerpt", "B"), ("body", "C"))
     title = models.CharField(max_length=250)
     slug = models.SlugField(max_length=270, unique=True)
     excerpt = models.TextField(blank=True, default="")
@@ -14,6 +22,40 @@ class Post(models.Model):
     meta_description = models.CharField(max_length=300, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    body_html = models.TextField(blank=True, default="", editable=False)
+    toc = models.JSONField(default=list, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    # Stored so the index can show it without loading body.
+    reading_time_minutes = models.PositiveSmallIntegerField(default=0, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="blog_post_search_gin"),
+            # Blog index: WHERE status = 'published' ORDER BY published_at DESC, id DESC.
+            models.Index(
+                fields=["-published_at", "-id"], condition=models.Q(status="published"), name="blog_post_published_idx"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Published posts are paginated by published_at, so it must never be NULL.
+        if self.status == "published" and not self.published_at:
+            self.published_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "body" in update_fields:
+            self.render()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render(self):
+        """Fill the ``RENDERED_FIELDS`` from ``body`` (no save)."""
+        rendered = render_body(self.body)
+        self.body_html = rendered.html
+        self.toc = rendered.toc
+        self.word_count = rendered.word_count
+        self.reading_time_minutes = rendered.reading_time_minutes
 
     def publish(self):
         self.status="published"
@@ -0,0 +1,59 @@
+"""Markdown rendering for post bodies, done once when a post is saved."""
+import html
+import math
+from dataclasses import dataclass
+
+import markdown
+import nh3
+from django.utils.html import strip_tags
+
+
+WORDS_PER_MINUTE = 200
+MARKDOWN_EXTENSIONS = ["toc", "tables", "fenced_code", "sane_lists"]
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+ALLOWED_ATTRIBUTES = {
+    **{tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()},
+    **{tag: {"id"} for tag in HEADINGS},
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "code": {"class"},
+    "th": {"style"},
+    "td": {"style"},
+}
+
+
+@dataclass(frozen=True)
+class RenderedBody:
+    html: str
+    toc: list
+    word_count: int
+    reading_time_minutes: int
+
+
+def reading_time(word_count: int) -> int:
+    """Whole minutes to read ``word_count`` words; at least 1 for any text."""
+    return math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0
+
+
+def _toc(tokens) -> list:
+    return [
+        {"id": t["id"], "title": html.unescape(t["name"]), "level": t["level"], "children": _toc(t["children"])}
+        for t in tokens
+    ]
+
+
+def render_body(text: str) -> RenderedBody:
+    """Markdown to sanitized HTML, plus the table of contents and word count.
+
+    Raw HTML in the source is sanitized, not trusted: scripts, event handlers
+    and non-http(s)/mailto links are stripped by nh3.
+    """
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    rendered = nh3.clean(
+        md.convert(text or ""),
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes={"http", "https", "mailto"},
+        filter_style_properties={"text-align"},
+    )
+    words = len(html.unescape(strip_tags(rendered)).split())
+    return RenderedBody(rendered, _toc(md.toc_tokens), words, reading_time(words))
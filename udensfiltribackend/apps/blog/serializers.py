@@ -1,7 +1,14 @@
 from rest_framework import serializers
+from config.fieldsets import SparseFieldsetSerializerMixin
 from .models import Post
 
-class PostSerializer(serializers.ModelSerializer):
+class PostListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """Blog index card; ``body`` is never selected for it."""
     class Meta:
         model=Post
-        fields=("id","title","slug","excerpt","body","cover_image_url","published_at","meta_title","meta_description")
+        fields=("id","title","slug","excerpt","cover_image_url","published_at","reading_time_minutes")
+
+class PostSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model=Post
+        fields=("id","title","slug","excerpt","body","body_html","toc","word_count","cover_image_url","published_at","reading_time_minutes","meta_title","meta_description")
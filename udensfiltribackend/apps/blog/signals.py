@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.cache import bump_generation
+from config.search import refresh_search_vector
+from .models import Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_generation(sender, **kwargs):
+    bump_generation(sender)
+
+
+post_save.connect(refresh_search_vector, sender=Post, dispatch_uid="blog_post_search_vector")
@@ -0,0 +1,140 @@
+import importlib
+import os
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from config.fastpath import serialize_values, values_plan, values_queryset
+from config.query_plans import QueryPlanAssertions
+from .models import Post
+from .serializers import PostListSerializer, PostSerializer
+
+
+class PostCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_publish_invalidates_cached_list(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title="Hard water", slug="hard-water", body="...")
+        self.assertEqual(self.client.get("/api/blog/posts/").data["results"], [])
+        with self.assertNumQueries(0):
+            self.client.get("/api/blog/posts/")
+        with self.captureOnCommitCallbacks(execute=True):
+            post.publish()
+        self.assertEqual([p["slug"] for p in self.client.get("/api/blog/posts/").data["results"]], ["hard-water"])
+
+
+class PostRepresentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(title="Hard water", slug="hard-water", excerpt="Short", body="word " * 450, status="published")
+
+    def test_reading_time_follows_body(self):
+        self.assertEqual(self.post.reading_time_minutes, 3)
+        self.post.body = "word"
+        self.post.save(update_fields=["body"])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.reading_time_minutes, 1)
+
+    def test_list_skips_body_and_detail_keeps_it(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as ctx:
+            item = client.get("/api/blog/posts/").data["results"][0]
+        self.assertEqual((item["excerpt"], item["reading_time_minutes"]), ("Short", 3))
+        self.assertNotIn("body", item)
+        self.assertFalse(any('"body"' in q["sql"] for q in ctx.captured_queries))
+        self.assertEqual(client.get("/api/blog/posts/hard-water/").data["body"], self.post.body)
+
+
+class PostFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Post.objects.create(title="Hard water", slug="hard-water", excerpt="Short", body="Long body", status="published")
+
+    def test_fields_and_omit_trim_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/blog/posts/?fields=slug,title")
+        self.assertEqual(list(r.data["results"][0]), ["title", "slug"])
+        self.assertNotIn('"body"', ctx.captured_queries[-1]["sql"])
+        r = self.client.get("/api/blog/posts/hard-water/?omit=body,meta_title")
+        self.assertNotIn("body", r.data)
+        self.assertEqual(r.data["excerpt"], "Short")
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.client.get("/api/blog/posts/?fields=secret").status_code, 400)
+
+
+class PostValuesPathTests(TestCase):
+    def test_values_rows_match_serializer(self):
+        cache.clear()
+        Post.objects.create(title="Hard water", slug="hard-water", body="...", status="published")
+        Post.objects.create(title="Draft", slug="draft")
+        queryset = Post.objects.order_by("-published_at", "-id")
+        for serializer_class in (PostSerializer, PostListSerializer):
+            plan = values_plan(serializer_class())
+            self.assertEqual(serialize_values(values_queryset(queryset, plan), plan), serializer_class(queryset, many=True).data)
+        self.assertEqual(
+            APIClient().get("/api/blog/posts/").data["results"],
+            PostListSerializer(queryset.filter(status="published"), many=True).data,
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL-specific")
+class PostQueryPlanTests(QueryPlanAssertions, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        Post.objects.bulk_create(
+            Post(title=f"Post {i}", slug=f"post-{i}", status="published" if i % 4 else "draft",
+                 published_at=now - timedelta(hours=i) if i % 4 else None)
+            for i in range(5000)
+        )
+        cls.analyze(Post)
+
+    def test_index_and_detail_use_indexes(self):
+        cache.clear()
+        client = APIClient()
+        with self.assertNoSeqScan(Post):
+            r = client.get("/api/blog/posts/")
+            client.get(r.data["next"])
+            client.get("/api/blog/posts/post-1/")
+
+
+class PostRenderingTests(TestCase):
+    BODY = "# Cietais ūdens\n\nKaļķakmens <script>alert(1)</script> [x](javascript:alert(1))\n\n## Filtri & mīkstinātāji\n\nTeksts.\n"
+
+    def test_save_renders_sanitized_html_and_toc(self):
+        post = Post.objects.create(title="Hard water", slug="hard-water", body=self.BODY)
+        self.assertIn('<h1 id="cietais-udens">Cietais ūdens</h1>', post.body_html)
+        self.assertNotIn("<script", post.body_html)
+        self.assertNotIn("javascript:", post.body_html)
+        self.assertEqual(post.toc[0]["title"], "Cietais ūdens")
+        self.assertEqual(post.toc[0]["children"][0]["title"], "Filtri & mīkstinātāji")
+        self.assertEqual((post.word_count, post.reading_time_minutes), (8, 1))
+
+    def test_backfill_command_renders_unrendered_posts(self):
+        post = Post.objects.create(title="Hard water", slug="hard-water", body="Some *text*")
+        Post.objects.filter(pk=post.pk).update(body_html="", word_count=0)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("render_posts", stdout=open(os.devnull, "w"))
+        post.refresh_from_db()
+        self.assertEqual((post.body_html, post.word_count), ("<p>Some <em>text</em></p>", 2))
+
+    def test_migration_backfill_matches_runtime_rendering(self):
+        post = Post.objects.create(title="Hard water", slug="hard-water", body=self.BODY)
+        Post.objects.filter(pk=post.pk).update(body_html="", toc=[], word_count=0, reading_time_minutes=0)
+        importlib.import_module("apps.blog.migrations.0006_render_post_bodies").render_posts(apps, None)
+        rendered = Post.objects.get(pk=post.pk)
+        for field in ("body_html", "toc", "word_count", "reading_time_minutes"):
+            self.assertEqual(getattr(rendered, field), getattr(post, field))
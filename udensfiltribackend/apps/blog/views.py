@@ -1,10 +1,17 @@
 from rest_framework import viewsets, permissions
+from config.cache import CachedResponseMixin
+from config.fastpath import ValuesListMixin
+from config.fieldsets import SparseFieldsetViewMixin
 from .models import Post
-from .serializers import PostSerializer
+from .serializers import PostListSerializer, PostSerializer
 
-class PostViewSet(viewsets.ReadOnlyModelViewSet):
+class PostViewSet(SparseFieldsetViewMixin, CachedResponseMixin, ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class=PostSerializer
     permission_classes=[permissions.AllowAny]
     lookup_field="slug"
+    cache_models=(Post,)
+    def get_serializer_class(self):
+        return PostListSerializer if self.action=="list" else PostSerializer
     def get_queryset(self):
-        return Post.objects.filter(status="published").order_by("-published_at","-id")
+        qs = Post.objects.filter(status="published").order_by("-published_at","-id").defer("search_vector")
+        return qs.defer("body") if self.action=="list" else qs
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Equipment, PlumbingCase, CaseMessage
+from config.admin_search import IndexedSearchMixin
+from .models import CaseAttachment, Equipment, PlumbingCase, CaseMessage
 
 class CaseMessageInline(admin.TabularInline):
     model = CaseMessage
@@ -8,14 +9,16 @@ class CaseMessageInline(admin.TabularInline):
     fields=("sender","message","is_internal","created_at")
 
 @admin.register(Equipment)
-class EquipmentAdmin(admin.ModelAdmin):
+class EquipmentAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display=("name","manufacturer","model","user")
     search_fields=("name","manufacturer","model","serial_number","user__phone")
 
 @admin.register(PlumbingCase)
-class PlumbingCaseAdmin(admin.ModelAdmin):
-    list_display=("title","user","status","priority","created_at")
+class PlumbingCaseAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    list_display=("title","user","status","priority","message_count","last_message_at","created_at")
     list_filter=("status","priority")
+    # Counts per status/priority live on /api/cases/dashboard/; skip the unfiltered COUNT(*).
+    show_full_result_count=False
     search_fields=("title","description","user__phone")
     inlines=[CaseMessageInline]
 
@@ -23,3 +26,18 @@ class PlumbingCaseAdmin(admin.ModelAdmin):
 class CaseMessageAdmin(admin.ModelAdmin):
     list_display=("case","sender","is_internal","created_at")
     list_filter=("is_internal",)
+
+@admin.register(CaseAttachment)
+class CaseAttachmentAdmin(admin.ModelAdmin):
+    list_display=("filename","case","content_type","size","thumbnail_status","created_at")
+    list_filter=("thumbnail_status",)
+    list_select_related=("case",)
+    # The storage has no URL, which the admin file widgets need; show the stored names instead.
+    exclude=("file","thumbnail")
+    readonly_fields=("stored_file","stored_thumbnail")
+    @admin.display(description="file")
+    def stored_file(self, obj):
+        return obj.file.name
+    @admin.display(description="thumbnail")
+    def stored_thumbnail(self, obj):
+        return obj.thumbnail.name
@@ -0,0 +1,159 @@
+"""Per-process fan-out of new case messages to open SSE streams.
+
+With the ``postgres`` backend a committed message is announced with
+``NOTIFY case_messages, '<id>'``; every worker process keeps one ``LISTEN``
+connection, loads the message once and hands it to all of its subscribers.
+The ``local`` backend skips the database round trip and publishes straight from
+the saving process, which is enough for development and tests.
+"""
+import asyncio
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+
+from config.renderers import ORJSONRenderer
+from .models import CaseMessage
+from .serializers import CaseMessageSerializer
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "case_messages"
+QUEUE_SIZE = 100
+
+
+def build_event(message):
+    return {
+        "id": message.id,
+        "case": message.case_id,
+        "is_internal": message.is_internal,
+        "data": ORJSONRenderer().render(CaseMessageSerializer(message).data),
+    }
+
+
+def load_events(ids=None, case_id=None, after=None, include_internal=False, limit=None):
+    qs = CaseMessage.objects.select_related("sender").prefetch_related("attachments").order_by("id")
+    if ids is not None:
+        qs = qs.filter(id__in=ids)
+    if case_id is not None:
+        qs = qs.filter(case_id=case_id)
+    if after is not None:
+        qs = qs.filter(id__gt=after)
+    if not include_internal:
+        qs = qs.filter(is_internal=False)
+    if limit is not None:
+        qs = qs[:limit]
+    return [build_event(m) for m in qs]
+
+
+class Subscription:
+    def __init__(self, loop, case_id=None, include_internal=False):
+        self.loop = loop
+        self.case_id = case_id
+        self.include_internal = include_internal
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+
+    def accepts(self, event):
+        if event["is_internal"] and not self.include_internal:
+            return False
+        return self.case_id is None or event["case"] == self.case_id
+
+    def offer(self, event):
+        # Runs on the subscriber's loop. A reader that falls this far behind is
+        # closed instead; EventSource reconnects and replays from Last-Event-ID.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class MessageHub:
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def subscribe(self, case_id=None, include_internal=False):
+        sub = Subscription(asyncio.get_running_loop(), case_id, include_internal)
+        with self._lock:
+            self._subscriptions.add(sub)
+        if settings.CASE_EVENTS_BACKEND == "postgres":
+            self._ensure_listener()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscriptions.discard(sub)
+
+    def publish(self, event):
+        """Hand ``event`` to every matching subscriber; safe to call from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for sub in subscriptions:
+            if sub.loop.is_closed():
+                self.unsubscribe(sub)
+            elif sub.accepts(event):
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+
+    def close_all(self):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for sub in subscriptions:
+            if not sub.loop.is_closed():
+                sub.loop.call_soon_threadsafe(sub.close)
+
+    def _ensure_listener(self):
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self):
+        import psycopg
+
+        db = connection.settings_dict
+        params = {
+            "dbname": db["NAME"], "user": db.get("USER"), "password": db.get("PASSWORD"),
+            "host": db.get("HOST") or None, "port": db.get("PORT") or None,
+        }
+        delay = 1
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(autocommit=True, **params) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    delay = 1
+                    async for notify in conn.notifies():
+                        for event in await sync_to_async(load_events)(ids=[int(notify.payload)], include_internal=True):
+                            self.publish(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("case message listener failed, reconnecting in %ss", delay)
+                # Notifications sent while disconnected are lost: make the
+                # streams reconnect so they replay from their Last-Event-ID.
+                self.close_all()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+
+hub = MessageHub()
+
+
+def _announce(message_id):
+    if settings.CASE_EVENTS_BACKEND == "postgres":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, str(message_id)])
+    else:
+        for event in load_events(ids=[message_id], include_internal=True):
+            hub.publish(event)
+
+
+def announce_message(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: _announce(instance.pk))
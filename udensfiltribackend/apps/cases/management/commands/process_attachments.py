@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.cases.uploads import process_pending, purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails for new case attachments and drop abandoned partial uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--watch", type=float, metavar="SECONDS", help="Keep running, polling every SECONDS")
+
+    def handle(self, *args, batch_size=50, watch=None, **options):
+        self.run(batch_size)
+        while watch:
+            time.sleep(watch)
+            self.run(batch_size)
+
+    def run(self, batch_size):
+        purged = purge_stale_uploads()
+        processed = 0
+        while True:
+            done = process_pending(batch_size)
+            processed += done
+            if done < batch_size:
+                break
+        if processed or purged:
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} attachment(s), purged {purged} stale upload(s)"))
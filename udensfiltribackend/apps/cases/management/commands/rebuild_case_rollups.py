@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.cases.rollups import rebuild_case_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount the staff dashboard's open-case rollups from the cases table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_case_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup row(s)"))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:42
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+from config.db_operations import CreateExtensionIfAvailable, PostgresAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        CreateExtensionIfAvailable("pg_trgm"),
+        PostgresAddIndex(
+            model_name="plumbingcase",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"), name="gin_trgm_ops"
+                ),
+                name="cases_case_title_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+        PostgresAddIndex(
+            model_name="plumbingcase",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("description"),
+                    name="gin_trgm_ops",
+                ),
+                name="cases_case_description_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+    ]
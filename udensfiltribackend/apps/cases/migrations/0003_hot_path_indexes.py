@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0002_trigram_search_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="casemessage",
+            index=models.Index(
+                fields=["case", "created_at"], name="cases_message_case_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plumbingcase",
+            index=models.Index(
+                fields=["user", "-created_at"], name="cases_case_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plumbingcase",
+            index=models.Index(fields=["-created_at"], name="cases_case_created_idx"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0003_hot_path_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="casemessage",
+            index=models.Index(fields=["case", "id"], name="cases_message_case_id"),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+from config.db_operations import PortableAddField
+
+
+def populate_summaries(apps, schema_editor):
+    PlumbingCase = apps.get_model("cases", "PlumbingCase")
+    CaseMessage = apps.get_model("cases", "CaseMessage")
+    visible = CaseMessage.objects.filter(case=OuterRef("pk"), is_internal=False)
+    latest = visible.order_by("-created_at", "-id")
+    count = visible.order_by().values("case").annotate(n=Count("pk")).values("n")
+    PlumbingCase.objects.update(
+        message_count=Coalesce(Subquery(count), 0),
+        last_message_at=Subquery(latest.values("created_at")[:1]),
+        last_message_preview=Coalesce(Substr(Subquery(latest.values("message")[:1]), 1, 200), Value("")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0004_message_case_id_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        PortableAddField(
+            model_name="plumbingcase",
+            name="last_message_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        PortableAddField(
+            model_name="plumbingcase",
+            name="last_message_preview",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=200
+            ),
+        ),
+        PortableAddField(
+            model_name="plumbingcase",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="CaseReadMarker",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("read_count", models.PositiveIntegerField(default=0)),
+                ("read_at", models.DateTimeField(auto_now=True)),
+                (
+                    "case",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="read_markers",
+                        to="cases.plumbingcase",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="case_read_markers",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "case"), name="cases_read_marker_user_case"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:32
+
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    PlumbingCase = apps.get_model("cases", "PlumbingCase")
+    CaseRollup = apps.get_model("cases", "CaseRollup")
+    groups = (PlumbingCase.objects.exclude(status__in=("done", "closed"))
+              .values("status", "priority", manufacturer=Coalesce("equipment__manufacturer", Value("")),
+                      opened_on=TruncDate("created_at"))
+              .annotate(n=Count("pk")).order_by())
+    CaseRollup.objects.bulk_create(CaseRollup(count=g.pop("n"), **g) for g in groups)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0006_attachments"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CaseRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("status", models.CharField(max_length=32)),
+                ("priority", models.CharField(max_length=32)),
+                (
+                    "manufacturer",
+                    models.CharField(blank=True, default="", max_length=200),
+                ),
+                ("opened_on", models.DateField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("status", "priority", "manufacturer", "opened_on"),
+                        name="cases_rollup_key",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
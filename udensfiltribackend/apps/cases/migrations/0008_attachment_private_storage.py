@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:47
+
+import apps.cases.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0007_case_rollups"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="caseattachment",
+            name="file",
+            field=models.FileField(
+                max_length=255,
+                storage=apps.cases.storage.AttachmentStorage(),
+                upload_to="",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="caseattachment",
+            name="thumbnail",
+            field=models.FileField(
+                blank=True,
+                default="",
+                max_length=255,
+                storage=apps.cases.storage.AttachmentStorage(),
+                upload_to="",
+            ),
+        ),
+    ]
@@ -1,6 +1,12 @@
-from django.db import models
+import uuid
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.conf import settings
 
+from .storage import attachment_storage
+
 class Equipment(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="equipment")
     name = models.CharField(max_length=200)
@@ -20,12 +26,88 @@ class PlumbingCase(models.Model):
     priority = models.CharField(max_length=32, default="normal")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Summary of the customer-visible thread, kept by apps.cases.summary.
+    message_count = models.PositiveIntegerField(default=0, editable=False)
+    last_message_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_message_preview = models.CharField(max_length=200, blank=True, default="", editable=False)
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="cases_case_title_trgm"),
+            GinIndex(OpClass(Upper("description"), name="gin_trgm_ops"), name="cases_case_description_trgm"),
+            models.Index(fields=["user", "-created_at"], name="cases_case_user_created_idx"),
+            models.Index(fields=["-created_at"], name="cases_case_created_idx"),
+        ]
+    def save(self, *args, **kwargs):
+        # The dashboard rollup is adjusted from pre/post_save; commit both or neither.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
     def __str__(self): return f"{self.title} ({self.user.phone})"
 
+class CaseRollup(models.Model):
+    """Open-case counts per dashboard dimension, kept by apps.cases.rollups."""
+    status = models.CharField(max_length=32)
+    priority = models.CharField(max_length=32)
+    manufacturer = models.CharField(max_length=200, blank=True, default="")
+    opened_on = models.DateField()
+    count = models.IntegerField(default=0)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["status", "priority", "manufacturer", "opened_on"], name="cases_rollup_key"),
+        ]
+
 class CaseMessage(models.Model):
     case = models.ForeignKey(PlumbingCase, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="case_messages")
     message = models.TextField(blank=True, default="")
     is_internal = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    class Meta: ordering=("created_at",)
+    class Meta:
+        ordering=("created_at",)
+        indexes = [
+            models.Index(fields=["case", "created_at"], name="cases_message_case_created"),
+            models.Index(fields=["case", "id"], name="cases_message_case_id"),
+        ]
+    def save(self, *args, **kwargs):
+        # The case summary is updated from post_save; commit both or neither.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+class CaseReadMarker(models.Model):
+    """How much of a case thread a user has seen, as a position in ``message_count``."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="case_read_markers")
+    case = models.ForeignKey(PlumbingCase, on_delete=models.CASCADE, related_name="read_markers")
+    read_count = models.PositiveIntegerField(default=0)
+    read_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "case"], name="cases_read_marker_user_case")]
+
+
+class AttachmentUpload(models.Model):
+    """A resumable upload in progress; its bytes sit in a partial file under ATTACHMENT_ROOT."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="attachment_uploads")
+    case = models.ForeignKey(PlumbingCase, on_delete=models.CASCADE, related_name="uploads")
+    filename = models.CharField(max_length=200)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class CaseAttachment(models.Model):
+    THUMBNAIL_STATUS=[("pending","pending"),("done","done"),("skipped","skipped"),("failed","failed")]
+    case = models.ForeignKey(PlumbingCase, on_delete=models.CASCADE, related_name="attachments")
+    message = models.ForeignKey(CaseMessage, on_delete=models.SET_NULL, null=True, blank=True, related_name="attachments")
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="case_attachments")
+    file = models.FileField(max_length=255, storage=attachment_storage)
+    filename = models.CharField(max_length=200)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    thumbnail = models.FileField(max_length=255, blank=True, default="", storage=attachment_storage)
+    thumbnail_status = models.CharField(max_length=16, choices=THUMBNAIL_STATUS, default="pending")
+    created_at = models.DateTimeField(auto_now_add=True)
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(thumbnail_status="pending"), name="cases_attachment_pending_idx"),
+        ]
+    def __str__(self): return self.filename
@@ -4,7 +4,8 @@ class IsOwnerOrSuperuser(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.is_authenticated and request.user.is_superuser:
             return True
-        owner = getattr(obj, "user", None)
-        if owner is None and hasattr(obj, "case"):
-            owner = obj.case.user
-        return request.user.is_authenticated and owner == request.user
+        # Compare ids: obj.user / obj.case.user would each load a User row.
+        owner_id = getattr(obj, "user_id", None)
+        if owner_id is None and hasattr(obj, "case_id"):
+            owner_id = obj.case.user_id
+        return request.user.is_authenticated and owner_id == request.user.id
@@ -0,0 +1,111 @@
+"""Incrementally maintained open-case counts behind the staff dashboard.
+
+Each ``CaseRollup`` row counts open cases sharing a status, priority,
+equipment manufacturer and opening date. Case and equipment saves move
+counts between rows, so the dashboard reads only this table. Age buckets are
+derived from ``opened_on`` at read time and stay correct as days pass. Bulk
+``QuerySet.update()`` calls bypass the signals; run ``rebuild_case_rollups``
+after those.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import CaseRollup, Equipment, PlumbingCase
+
+CLOSED_STATUSES = ("done", "closed")
+# (max age in days, label); None closes the last bucket.
+AGE_BUCKETS = ((1, "0-1d"), (7, "2-7d"), (30, "8-30d"), (None, "31d+"))
+
+
+def _case_key(status, priority, equipment_id, created_at):
+    if status in CLOSED_STATUSES:
+        return None
+    manufacturer = ""
+    if equipment_id:
+        manufacturer = Equipment.objects.filter(pk=equipment_id).values_list("manufacturer", flat=True).first() or ""
+    return (status, priority, manufacturer, timezone.localdate(created_at))
+
+
+def _apply(key, delta):
+    if key is None or not delta:
+        return
+    status, priority, manufacturer, opened_on = key
+    rollup, created = CaseRollup.objects.get_or_create(
+        status=status, priority=priority, manufacturer=manufacturer, opened_on=opened_on, defaults={"count": delta},
+    )
+    if not created:
+        CaseRollup.objects.filter(pk=rollup.pk).update(count=F("count") + delta)
+
+
+def remember_case(instance):
+    """Lock and record the stored state of a case about to be saved."""
+    instance._rollup_key = None
+    if instance.pk:
+        row = (PlumbingCase.objects.select_for_update().filter(pk=instance.pk)
+               .values_list("status", "priority", "equipment_id", "created_at").first())
+        if row:
+            instance._rollup_key = _case_key(*row)
+
+
+def case_saved(instance):
+    old = getattr(instance, "_rollup_key", None)
+    new = _case_key(instance.status, instance.priority, instance.equipment_id, instance.created_at)
+    if old != new:
+        _apply(old, -1)
+        _apply(new, 1)
+
+
+def case_deleted(instance):
+    _apply(_case_key(instance.status, instance.priority, instance.equipment_id, instance.created_at), -1)
+
+
+def move_manufacturer(equipment, old, new):
+    """Move the equipment's open cases from ``old`` manufacturer rows to ``new`` ones."""
+    groups = (PlumbingCase.objects.filter(equipment=equipment).exclude(status__in=CLOSED_STATUSES)
+              .values("status", "priority", opened_on=TruncDate("created_at")).annotate(n=Count("pk")).order_by())
+    for group in groups:
+        _apply((group["status"], group["priority"], old, group["opened_on"]), -group["n"])
+        _apply((group["status"], group["priority"], new, group["opened_on"]), group["n"])
+
+
+@transaction.atomic
+def rebuild_case_rollups() -> int:
+    """Recount everything from the cases table; returns the number of rollup rows."""
+    CaseRollup.objects.all().delete()
+    groups = (PlumbingCase.objects.exclude(status__in=CLOSED_STATUSES)
+              .values("status", "priority", manufacturer=Coalesce("equipment__manufacturer", Value("")),
+                      opened_on=TruncDate("created_at"))
+              .annotate(n=Count("pk")).order_by())
+    rows = CaseRollup.objects.bulk_create(CaseRollup(count=g.pop("n"), **g) for g in groups)
+    return len(rows)
+
+
+def _age_label(opened_on, today):
+    age = (today - opened_on).days
+    for limit, label in AGE_BUCKETS:
+        if limit is None or age <= limit:
+            return label
+
+
+def dashboard():
+    """Open cases by status, priority, age bucket and manufacturer, from the rollup table alone."""
+    today = timezone.localdate()
+    result = {
+        "open_total": 0,
+        "by_status": {},
+        "by_priority": {},
+        "by_age": {label: 0 for _, label in AGE_BUCKETS},
+        "by_manufacturer": {},
+    }
+    rows = CaseRollup.objects.filter(count__gt=0).values_list("status", "priority", "manufacturer", "opened_on", "count")
+    for status, priority, manufacturer, opened_on, count in rows:
+        result["open_total"] += count
+        result["by_status"][status] = result["by_status"].get(status, 0) + count
+        result["by_priority"][priority] = result["by_priority"].get(priority, 0) + count
+        label = _age_label(opened_on, today)
+        result["by_age"][label] += count
+        manufacturer = manufacturer or "unknown"
+        result["by_manufacturer"][manufacturer] = result["by_manufacturer"].get(manufacturer, 0) + count
+    return result
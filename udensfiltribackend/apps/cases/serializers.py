@@ -1,14 +1,64 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Equipment, PlumbingCase, CaseMessage
+from config.fieldsets import SparseFieldsetSerializerMixin
+from .models import AttachmentUpload, CaseAttachment, Equipment, PlumbingCase, CaseMessage
 
-class EquipmentSerializer(serializers.ModelSerializer):
+class EquipmentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta: model=Equipment; fields=("id","name","manufacturer","model","serial_number","notes")
 
-class CaseMessageSerializer(serializers.ModelSerializer):
+def _validate_own_case(serializer, value):
+    req = serializer.context.get("request")
+    if req and req.user.is_authenticated and (not req.user.is_superuser) and value.user_id != req.user.id:
+        raise serializers.ValidationError("You cannot post messages to this case")
+    return value
+
+class CaseAttachmentSerializer(serializers.ModelSerializer):
+    # Files are private: these point at the authenticated download endpoints.
+    # Built from API_BASE_URL, not the request, because SSE events serialize
+    # messages without one and must match the REST representation.
+    file = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
+    class Meta:
+        model=CaseAttachment
+        fields=("id","filename","content_type","size","file","thumbnail","thumbnail_status","created_at")
+        read_only_fields=fields
+    def _url(self, name, obj):
+        return settings.API_BASE_URL.rstrip("/") + reverse(name, args=[obj.pk])
+    def get_file(self, obj):
+        return self._url("attachments-download", obj)
+    def get_thumbnail(self, obj):
+        return self._url("attachments-thumbnail", obj) if obj.thumbnail else None
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+    class Meta:
+        model=AttachmentUpload
+        fields=("id","case","filename","content_type","size","offset","chunk_size","created_at")
+        read_only_fields=("offset","created_at")
+    def get_chunk_size(self, obj):
+        return settings.ATTACHMENT_CHUNK_SIZE
+    def validate_case(self, value):
+        return _validate_own_case(self, value)
+    def validate_size(self, value):
+        if not 0 < value <= settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.ATTACHMENT_MAX_SIZE} bytes")
+        return value
+    def validate_content_type(self, value):
+        if not value.startswith(settings.ATTACHMENT_CONTENT_TYPES):
+            raise serializers.ValidationError("Unsupported attachment type")
+        return value
+
+class CaseMessageSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     sender_phone = serializers.CharField(source="sender.phone", read_only=True)
+    attachments = CaseAttachmentSerializer(many=True, read_only=True)
+    attachment_ids = serializers.PrimaryKeyRelatedField(
+        many=True, write_only=True, required=False, queryset=CaseAttachment.objects.filter(message__isnull=True),
+    )
     class Meta:
         model=CaseMessage
-        fields=("id","case","sender","sender_phone","message","is_internal","created_at")
+        fields=("id","case","sender","sender_phone","message","is_internal","created_at","attachments","attachment_ids")
         read_only_fields=("sender","created_at")
     def validate_is_internal(self, value):
         req = self.context.get("request")
@@ -17,26 +67,51 @@ class CaseMessageSerializer(serializers.ModelSerializer):
         return value
 
     def validate_case(self, value):
+        return _validate_own_case(self, value)
+
+    def validate(self, attrs):
         req = self.context.get("request")
-        if req and req.user.is_authenticated and (not req.user.is_superuser) and value.user_id != req.user.id:
-            raise serializers.ValidationError("You cannot post messages to this case")
-        return value
+        case = attrs.get("case") or getattr(self.instance, "case", None)
+        for attachment in attrs.get("attachment_ids", ()):
+            if attachment.case_id != case.id or (req and attachment.uploaded_by_id != req.user.id):
+                raise serializers.ValidationError({"attachment_ids": "Attachments must be your own uploads to this case"})
+        return attrs
 
-class PlumbingCaseSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        attachments = validated_data.pop("attachment_ids", [])
+        # Atomic so the new-message event (sent on commit) already sees the attachments.
+        with transaction.atomic():
+            message = super().create(validated_data)
+            if attachments:
+                CaseAttachment.objects.filter(pk__in=[a.pk for a in attachments]).update(message=message)
+        return message
+
+    def update(self, instance, validated_data):
+        validated_data.pop("attachment_ids", None)
+        return super().update(instance, validated_data)
+
+class PlumbingCaseSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Annotated by summary.with_unread_counts on list/retrieve.
+    unread_count = serializers.IntegerField(read_only=True, default=0)
     class Meta:
         model=PlumbingCase
-        fields=("id","title","description","status","priority","equipment","created_at","updated_at")
+        fields=("id","title","description","status","priority","equipment","created_at","updated_at",
+                "message_count","last_message_at","last_message_preview","unread_count")
         read_only_fields=("status","created_at","updated_at")
 
-class PlumbingCaseDetailSerializer(serializers.ModelSerializer):
+class PlumbingCaseDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     messages = serializers.SerializerMethodField()
+    unread_count = serializers.IntegerField(read_only=True, default=0)
     equipment_detail = EquipmentSerializer(source="equipment", read_only=True)
     class Meta:
         model=PlumbingCase
-        fields=("id","title","description","status","priority","equipment","equipment_detail","created_at","updated_at","messages")
+        fields=("id","title","description","status","priority","equipment","equipment_detail","created_at","updated_at",
+                "message_count","last_message_at","last_message_preview","unread_count","messages")
     def get_messages(self, obj):
-        qs = obj.messages.all()
-        req = self.context.get("request")
-        if req and not req.user.is_superuser:
-            qs = qs.filter(is_internal=False)
-        return CaseMessageSerializer(qs, many=True).data
+        messages = getattr(obj, "visible_messages", None)
+        if messages is None:
+            messages = obj.messages.select_related("sender").prefetch_related("attachments")
+            req = self.context.get("request")
+            if req and not req.user.is_superuser:
+                messages = messages.filter(is_internal=False)
+        return CaseMessageSerializer(messages, many=True).data
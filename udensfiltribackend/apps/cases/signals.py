@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .events import announce_message
+from .models import CaseAttachment, CaseMessage, Equipment, PlumbingCase
+from .rollups import case_deleted, case_saved, move_manufacturer, remember_case
+from .summary import record_message, refresh_case_summaries
+
+
+post_save.connect(announce_message, sender=CaseMessage, dispatch_uid="cases_message_announce")
+
+
+@receiver(post_save, sender=CaseMessage)
+def update_case_summary(sender, instance, created, **kwargs):
+    if created:
+        record_message(instance)
+    else:
+        refresh_case_summaries([instance.case_id])
+
+
+@receiver(post_delete, sender=CaseMessage)
+def refresh_case_summary(sender, instance, **kwargs):
+    refresh_case_summaries([instance.case_id])
+
+
+@receiver(post_delete, sender=CaseAttachment)
+def delete_attachment_files(sender, instance, **kwargs):
+    for field in (instance.file, instance.thumbnail):
+        if field:
+            field.delete(save=False)
+
+
+@receiver(pre_save, sender=PlumbingCase)
+def remember_case_rollup(sender, instance, raw=False, **kwargs):
+    if not raw:
+        remember_case(instance)
+
+
+@receiver(post_save, sender=PlumbingCase)
+def update_case_rollup(sender, instance, raw=False, **kwargs):
+    if not raw:
+        case_saved(instance)
+
+
+@receiver(post_delete, sender=PlumbingCase)
+def remove_case_rollup(sender, instance, **kwargs):
+    case_deleted(instance)
+
+
+@receiver(pre_save, sender=Equipment)
+def remember_manufacturer(sender, instance, raw=False, **kwargs):
+    instance._old_manufacturer = None
+    if instance.pk and not raw:
+        instance._old_manufacturer = Equipment.objects.filter(pk=instance.pk).values_list("manufacturer", flat=True).first()
+
+
+@receiver(post_save, sender=Equipment)
+def move_manufacturer_rollup(sender, instance, created, raw=False, **kwargs):
+    old = getattr(instance, "_old_manufacturer", None)
+    if not created and not raw and old is not None and old != instance.manufacturer:
+        move_manufacturer(instance, old, instance.manufacturer)
+
+
+@receiver(pre_delete, sender=Equipment)
+def release_manufacturer_rollup(sender, instance, **kwargs):
+    # Cases are detached with an UPDATE (SET_NULL) that sends no signals.
+    move_manufacturer(instance, instance.manufacturer, "")
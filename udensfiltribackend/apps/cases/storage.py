@@ -0,0 +1,53 @@
+"""Private file storage for case attachments.
+
+Files live under ``ATTACHMENT_ROOT``, which no web server location exposes, and
+have no public URL: they are only served by the authenticated download view.
+"""
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.deconstruct import deconstructible
+from django.utils.http import content_disposition_header
+
+
+@deconstructible
+class AttachmentStorage(FileSystemStorage):
+    # Read on every access rather than cached, so ATTACHMENT_ROOT can be
+    # overridden (e.g. in tests) after the model fields are built.
+    @property
+    def base_location(self):
+        return settings.ATTACHMENT_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    @property
+    def base_url(self):
+        return None
+
+
+attachment_storage = AttachmentStorage()
+
+
+def serve(name, content_type, filename, as_attachment=True):
+    """Response for the stored file ``name``, sent as ``content_type``.
+
+    Hands the file to nginx through ``X-Accel-Redirect`` when
+    ``ATTACHMENT_ACCEL_PREFIX`` is set, and streams it from Django otherwise.
+    Browsers must not sniff a different type from the bytes.
+    """
+    if not name or not attachment_storage.exists(name):
+        raise Http404
+    if settings.ATTACHMENT_ACCEL_PREFIX:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.ATTACHMENT_ACCEL_PREFIX.rstrip("/") + "/" + quote(name)
+    else:
+        response = FileResponse(attachment_storage.open(name, "rb"), content_type=content_type)
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    response["X-Content-Type-Options"] = "nosniff"
+    response["Cache-Control"] = "private, max-age=3600"
+    return response
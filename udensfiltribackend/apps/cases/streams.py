@@ -0,0 +1,102 @@
+"""Server-Sent Events streams of new case messages.
+
+These are plain async Django views rather than DRF views so an idle connection
+costs a coroutine instead of a worker thread; run them under an ASGI server
+(see the README). Clients resume with ``Last-Event-ID`` (sent automatically by
+EventSource) or ``?after=<message id>`` and get the missed messages replayed
+from the database before live delivery starts.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.accounts.auth import CookieJWTAuthentication
+from .events import hub, load_events
+from .models import PlumbingCase
+
+REPLAY_LIMIT = 500
+
+
+async def _authenticate(request):
+    try:
+        result = await sync_to_async(CookieJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+def _last_event_id(request):
+    raw = request.headers.get("Last-Event-ID") or request.GET.get("after")
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def _frame(event):
+    return b"id: %d\nevent: message\ndata: %s\n\n" % (event["id"], event["data"])
+
+
+async def _events(case_id, include_internal, last_id):
+    # Subscribe on the loop that consumes the stream, which under WSGI is not
+    # the one the view ran on.
+    sub = hub.subscribe(case_id=case_id, include_internal=include_internal)
+    try:
+        yield b"retry: %d\n\n" % settings.CASE_EVENTS_RETRY_MS
+        # Subscribed before the replay query, so nothing committed in between is
+        # lost; the id check below drops what the replay already sent.
+        if last_id is not None:
+            replay = await sync_to_async(load_events)(
+                case_id=case_id, after=last_id, include_internal=include_internal, limit=REPLAY_LIMIT,
+            )
+            for event in replay:
+                last_id = event["id"]
+                yield _frame(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), settings.CASE_EVENTS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if event is None:
+                return
+            if last_id is not None and event["id"] <= last_id:
+                continue
+            last_id = event["id"]
+            yield _frame(event)
+    finally:
+        hub.unsubscribe(sub)
+
+
+def _stream(request, case_id, include_internal):
+    events = _events(case_id, include_internal, _last_event_id(request))
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def case_events(request, pk):
+    """New messages on one case; internal notes only for superusers."""
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    cases = PlumbingCase.objects.filter(pk=pk)
+    if not user.is_superuser:
+        cases = cases.filter(user=user)
+    if not await cases.aexists():
+        raise Http404
+    return _stream(request, pk, user.is_superuser)
+
+
+async def staff_events(request):
+    """New messages across all cases, for the superusers who triage them."""
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if not user.is_superuser:
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+    return _stream(request, None, True)
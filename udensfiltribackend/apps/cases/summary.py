@@ -0,0 +1,57 @@
+"""Denormalized thread summaries and per-user unread counters.
+
+``PlumbingCase.message_count`` counts customer-visible messages only, so
+internal notes never leak into a customer's counters or preview. A read marker
+stores the ``message_count`` a user had seen; unread is the difference, which
+lets a case list compute every case's unread count in the list query itself.
+"""
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest, Substr
+
+from .models import CaseMessage, CaseReadMarker, PlumbingCase
+
+PREVIEW_LENGTH = PlumbingCase._meta.get_field("last_message_preview").max_length
+
+
+def record_message(message) -> None:
+    """Fold a newly created message into its case summary; one UPDATE per message."""
+    if message.is_internal:
+        return
+    # Row-locked increment; the guard keeps the newest message if two commits race.
+    newer = When(last_message_at__gt=message.created_at, then=F("last_message_at"))
+    PlumbingCase.objects.filter(pk=message.case_id).update(
+        message_count=F("message_count") + 1,
+        last_message_at=Case(newer, default=Value(message.created_at)),
+        last_message_preview=Case(
+            When(last_message_at__gt=message.created_at, then=F("last_message_preview")),
+            default=Value(message.message[:PREVIEW_LENGTH]),
+        ),
+    )
+    # Your own message is never unread.
+    count = PlumbingCase.objects.values_list("message_count", flat=True).get(pk=message.case_id)
+    mark_read(message.sender_id, message.case_id, count)
+
+
+def refresh_case_summaries(case_ids=None) -> int:
+    """Recompute summaries from the messages table (after edits/deletes, or all cases)."""
+    visible = CaseMessage.objects.filter(case=OuterRef("pk"), is_internal=False)
+    latest = visible.order_by("-created_at", "-id")
+    count = visible.order_by().values("case").annotate(n=Count("pk")).values("n")
+    qs = PlumbingCase.objects.all()
+    if case_ids is not None:
+        qs = qs.filter(pk__in=case_ids)
+    return qs.update(
+        message_count=Coalesce(Subquery(count), 0),
+        last_message_at=Subquery(latest.values("created_at")[:1]),
+        last_message_preview=Coalesce(Substr(Subquery(latest.values("message")[:1]), 1, PREVIEW_LENGTH), Value("")),
+    )
+
+
+def mark_read(user_id, case_id, count) -> None:
+    CaseReadMarker.objects.update_or_create(user_id=user_id, case_id=case_id, defaults={"read_count": count})
+
+
+def with_unread_counts(queryset, user):
+    """Annotate ``unread_count`` for ``user``: one indexed marker lookup per case row."""
+    read = CaseReadMarker.objects.filter(case=OuterRef("pk"), user=user).values("read_count")[:1]
+    return queryset.annotate(unread_count=Greatest(F("message_count") - Coalesce(Subquery(read), 0), 0))
@@ -1,6 +1,28 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 from apps.accounts.models import User
+from config.query_plans import QueryPlanAssertions
+from .events import load_events
+from .models import AttachmentUpload, CaseAttachment, CaseMessage, Equipment, PlumbingCase
+from .rollups import rebuild_case_rollups
+from .uploads import OffsetMismatch, partial_path, process_pending, write_chunk
 
 class CasesPermissionTests(TestCase):
     def setUp(self):
@@ -36,3 +58,464 @@ class CasesPermissionTests(TestCase):
         case_id = r.data["id"]
         r2 = self.client.post("/api/cases/messages/", {"case":case_id,"message":"note","is_internal":True}, format="json")
         self.assertEqual(r2.status_code, 400)
+
+    def test_case_list_supports_sparse_fieldsets(self):
+        self.client.post("/api/cases/cases/", {"title":"Leak","description":"Kitchen leak"}, format="json")
+        r = self.client.get("/api/cases/cases/?fields=id,title,status")
+        self.assertEqual(sorted(r.data["results"][0]), ["id","status","title"])
+        r = self.client.get(f"/api/cases/cases/{r.data['results'][0]['id']}/?omit=messages,description")
+        self.assertNotIn("messages", r.data)
+        self.assertEqual(r.data["title"], "Leak")
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL-specific")
+class CaseQueryPlanTests(QueryPlanAssertions, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(User(phone=f"+3712400{i:04d}") for i in range(50))
+        cls.user = users[0]
+        cases = PlumbingCase.objects.bulk_create(PlumbingCase(user=users[i % 50], title=f"Case {i}") for i in range(5000))
+        cls.case = next(c for c in cases if c.user_id == cls.user.id)
+        CaseMessage.objects.bulk_create(
+            CaseMessage(case=cases[i % 500], sender=cases[i % 500].user, message="...") for i in range(5000)
+        )
+        cls.analyze(PlumbingCase, CaseMessage)
+
+    def test_case_list_and_thread_use_indexes(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNoSeqScan(PlumbingCase, CaseMessage):
+            client.get("/api/cases/cases/")
+            client.get(f"/api/cases/cases/{self.case.id}/")
+            client.get(f"/api/cases/cases/{self.case.id}/messages/?after=1")
+
+
+class CaseQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(phone="+37121000002", password="StrongPass123")
+        self.admin = User.objects.create_superuser(phone="+37121000003", password="StrongPass123")
+        self.cases = [PlumbingCase.objects.create(user=self.user, title=f"Leak {i}") for i in range(5)]
+        self.case = self.cases[0]
+        for i in range(10):
+            CaseMessage.objects.create(case=self.case, sender=self.user if i % 2 else self.admin, message=f"m{i}", is_internal=i == 9)
+
+    def test_list_does_not_touch_messages(self):
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            r = self.client.get("/api/cases/cases/")
+        self.assertEqual(len(r.data["results"]), 5)
+
+    def test_detail_uses_one_filtered_prefetch(self):
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(3):  # case + equipment, visible messages + senders, attachments
+            r = self.client.get(f"/api/cases/cases/{self.case.id}/")
+        self.assertEqual(len(r.data["messages"]), 9)
+        self.assertFalse(any(m["is_internal"] for m in r.data["messages"]))
+        self.client.force_authenticate(self.admin)
+        with self.assertNumQueries(3):
+            r = self.client.get(f"/api/cases/cases/{self.case.id}/")
+        self.assertEqual(len(r.data["messages"]), 10)
+
+    def test_message_permission_compares_ids(self):
+        message = self.case.messages.filter(is_internal=False).first()
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(2):  # message + case + sender, attachments
+            self.assertEqual(self.client.get(f"/api/cases/messages/{message.id}/").status_code, 200)
+
+
+class CaseMessagesSinceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(phone="+37121000004", password="StrongPass123")
+        self.admin = User.objects.create_superuser(phone="+37121000005", password="StrongPass123")
+        self.case = PlumbingCase.objects.create(user=self.user, title="Leak")
+        self.messages = [
+            CaseMessage.objects.create(case=self.case, sender=self.admin, message=f"m{i}", is_internal=i == 2)
+            for i in range(5)
+        ]
+        self.url = f"/api/cases/cases/{self.case.id}/messages/"
+        self.client.force_authenticate(self.user)
+
+    def test_returns_delta_and_cursor(self):
+        r = self.client.get(self.url, {"after": self.messages[0].id})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([m["message"] for m in r.data["results"]], ["m1", "m3", "m4"])
+        self.assertEqual(r.data["cursor"], self.messages[4].id)
+        self.assertFalse(r.data["has_more"])
+
+        r = self.client.get(self.url, {"after": r.data["cursor"]})
+        self.assertEqual(r.data["results"], [])
+        self.assertEqual(r.data["cursor"], self.messages[4].id)
+
+    def test_limit_pages_through_thread(self):
+        r = self.client.get(self.url, {"limit": 2})
+        self.assertEqual([m["message"] for m in r.data["results"]], ["m0", "m1"])
+        self.assertTrue(r.data["has_more"])
+        r = self.client.get(self.url, {"after": r.data["cursor"], "limit": 2})
+        self.assertEqual([m["message"] for m in r.data["results"]], ["m3", "m4"])
+
+    def test_superuser_sees_internal_notes(self):
+        self.client.force_authenticate(self.admin)
+        r = self.client.get(self.url)
+        self.assertEqual(len(r.data["results"]), 5)
+
+    def test_rejects_bad_cursor_and_foreign_case(self):
+        self.assertEqual(self.client.get(self.url, {"after": "x"}).status_code, 400)
+        other = User.objects.create_user(phone="+37121000006", password="StrongPass123")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_poll_query_count(self):
+        with self.assertNumQueries(3):  # case ownership, message delta, attachments
+            self.client.get(self.url, {"after": self.messages[3].id})
+
+
+@override_settings(CASE_EVENTS_BACKEND="local")
+class CaseEventStreamTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone="+37121000007", password="StrongPass123")
+        self.admin = User.objects.create_superuser(phone="+37121000008", password="StrongPass123")
+        self.case = PlumbingCase.objects.create(user=self.user, title="Leak")
+        self.other_case = PlumbingCase.objects.create(user=self.admin, title="Other")
+        self.url = f"/api/cases/cases/{self.case.id}/events/"
+
+    def login(self, user):
+        self.async_client.cookies["access"] = str(AccessToken.for_user(user))
+
+    def post(self, case, message, is_internal=False):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CaseMessage.objects.create(case=case, sender=self.admin, message=message, is_internal=is_internal)
+
+    async def next_chunk(self, stream):
+        return await asyncio.wait_for(anext(stream), 5)
+
+    async def open(self, url, **headers):
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await self.next_chunk(stream)).startswith(b"retry:"))
+        return stream
+
+    async def test_case_stream_pushes_public_messages(self):
+        await sync_to_async(self.login)(self.user)
+        stream = await self.open(self.url)
+        await sync_to_async(self.post)(self.other_case, "elsewhere")
+        await sync_to_async(self.post)(self.case, "note", is_internal=True)
+        message = await sync_to_async(self.post)(self.case, "on my way")
+        chunk = await self.next_chunk(stream)
+        self.assertTrue(chunk.startswith(b"id: %d\nevent: message\n" % message.id))
+        self.assertIn(b'"on my way"', chunk)
+
+    async def test_replays_from_last_event_id(self):
+        await sync_to_async(self.login)(self.user)
+        seen = await sync_to_async(self.post)(self.case, "seen")
+        await sync_to_async(self.post)(self.case, "missed")
+        stream = await self.open(self.url, **{"Last-Event-ID": str(seen.id)})
+        self.assertIn(b'"missed"', await self.next_chunk(stream))
+
+    @override_settings(CASE_EVENTS_HEARTBEAT=0)
+    async def test_idle_stream_sends_heartbeats(self):
+        await sync_to_async(self.login)(self.user)
+        stream = await self.open(self.url)
+        self.assertEqual(await self.next_chunk(stream), b": ping\n\n")
+
+    async def test_staff_stream_covers_all_cases_and_internal_notes(self):
+        await sync_to_async(self.login)(self.admin)
+        stream = await self.open("/api/cases/events/")
+        await sync_to_async(self.post)(self.other_case, "triage", is_internal=True)
+        self.assertIn(b'"triage"', await self.next_chunk(stream))
+
+    async def test_access_rules(self):
+        self.assertEqual((await self.async_client.get(self.url)).status_code, 401)
+        await sync_to_async(self.login)(self.user)
+        self.assertEqual((await self.async_client.get("/api/cases/events/")).status_code, 403)
+        other = f"/api/cases/cases/{self.other_case.id}/events/"
+        self.assertEqual((await self.async_client.get(other)).status_code, 404)
+
+
+class CaseSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(phone="+37121000009", password="StrongPass123")
+        self.admin = User.objects.create_superuser(phone="+37121000010", password="StrongPass123")
+        self.case = PlumbingCase.objects.create(user=self.user, title="Leak")
+        self.other = PlumbingCase.objects.create(user=self.user, title="Drip")
+
+    def post(self, case, sender, message, is_internal=False):
+        return CaseMessage.objects.create(case=case, sender=sender, message=message, is_internal=is_internal)
+
+    def test_summary_follows_visible_messages(self):
+        self.post(self.case, self.admin, "first")
+        last = self.post(self.case, self.admin, "x" * 300)
+        self.post(self.case, self.admin, "internal", is_internal=True)
+        self.case.refresh_from_db()
+        self.assertEqual(self.case.message_count, 2)
+        self.assertEqual(self.case.last_message_at, last.created_at)
+        self.assertEqual(self.case.last_message_preview, "x" * 200)
+
+        last.delete()
+        self.case.refresh_from_db()
+        self.assertEqual((self.case.message_count, self.case.last_message_preview), (1, "first"))
+
+    def test_list_reports_unread_counts_in_one_query(self):
+        for i in range(3):
+            self.post(self.case, self.admin, f"reply {i}")
+        self.post(self.other, self.admin, "hello")
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            r = self.client.get("/api/cases/cases/")
+        unread = {c["id"]: c["unread_count"] for c in r.data["results"]}
+        self.assertEqual(unread, {self.case.id: 3, self.other.id: 1})
+
+        self.assertEqual(self.client.post(f"/api/cases/cases/{self.case.id}/read/").status_code, 200)
+        self.post(self.other, self.user, "thanks")  # own messages are never unread
+        r = self.client.get("/api/cases/cases/")
+        self.assertEqual({c["id"]: c["unread_count"] for c in r.data["results"]}, {self.case.id: 0, self.other.id: 0})
+
+        self.post(self.case, self.admin, "one more")
+        r = self.client.get(f"/api/cases/cases/{self.case.id}/")
+        self.assertEqual((r.data["unread_count"], r.data["last_message_preview"]), (1, "one more"))
+
+
+class AttachmentUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        settings_override = override_settings(ATTACHMENT_ROOT=self.media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.user = User.objects.create_user(phone="+37121000011", password="StrongPass123")
+        self.case = PlumbingCase.objects.create(user=self.user, title="Leak")
+        self.client.force_authenticate(self.user)
+
+    def start(self, payload, content_type="image/png", filename="leak photo.png"):
+        r = self.client.post("/api/cases/uploads/", {
+            "case": self.case.id, "filename": filename, "content_type": content_type, "size": len(payload),
+        }, format="json")
+        self.assertEqual(r.status_code, 201)
+        return r.data["id"]
+
+    def put(self, upload_id, chunk, offset, checksum=None):
+        return self.client.put(
+            f"/api/cases/uploads/{upload_id}/chunk/", data=chunk, content_type="application/octet-stream",
+            headers={"Upload-Offset": str(offset), "X-Chunk-SHA256": checksum or hashlib.sha256(chunk).hexdigest()},
+        )
+
+    def png(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 800), "navy").save(buffer, "PNG")
+        return buffer.getvalue()
+
+    def test_chunked_upload_resumes_and_assembles(self):
+        payload = os.urandom(300_000)
+        upload_id = self.start(payload, content_type="video/mp4", filename="leak.mp4")
+        r = self.put(upload_id, payload[:100_000], 0)
+        self.assertEqual((r.status_code, r.data["offset"]), (200, 100_000))
+
+        self.assertEqual(self.put(upload_id, payload[100_000:200_000], 0).status_code, 409)
+        r = self.put(upload_id, payload[100_000:200_000], 100_000, checksum="0" * 64)
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(self.client.get(f"/api/cases/uploads/{upload_id}/").data["offset"], 100_000)
+
+        self.put(upload_id, payload[100_000:200_000], 100_000)
+        with self.captureOnCommitCallbacks(execute=True):
+            r = self.put(upload_id, payload[200_000:], 200_000)
+        self.assertEqual(r.status_code, 201)
+        attachment = CaseAttachment.objects.get(pk=r.data["attachment"]["id"])
+        with attachment.file.open("rb") as f:
+            self.assertEqual(f.read(), payload)
+        self.assertEqual(attachment.thumbnail_status, "skipped")
+        self.assertFalse(AttachmentUpload.objects.exists())
+        self.assertFalse(os.path.exists(partial_path(AttachmentUpload(id=uuid.UUID(upload_id)))))
+
+    def test_failed_completion_leaves_a_resumable_upload(self):
+        payload = os.urandom(1000)
+        upload_id = self.start(payload, content_type="application/pdf", filename="invoice.pdf")
+        self.put(upload_id, payload[:600], 0)
+        with patch.object(CaseAttachment.objects, "create", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                self.put(upload_id, payload[600:], 600)
+        upload = AttachmentUpload.objects.get(pk=upload_id)
+        self.assertEqual(upload.offset, 600)
+        self.assertTrue(os.path.exists(partial_path(upload)))
+        self.assertFalse(any(files for _, _, files in os.walk(os.path.join(self.media, "case-attachments"))))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            r = self.put(upload_id, payload[600:], 600)
+        self.assertEqual(r.status_code, 201)
+        with CaseAttachment.objects.get(pk=r.data["attachment"]["id"]).file.open("rb") as f:
+            self.assertEqual(f.read(), payload)
+        self.assertFalse(os.path.exists(partial_path(upload)))
+
+    def test_chunk_is_read_without_a_lock_and_dropped_if_overtaken(self):
+        payload = os.urandom(1000)
+        upload_id = self.start(payload, content_type="application/pdf", filename="invoice.pdf")
+        self.put(upload_id, payload[:600], 0)
+        upload = AttachmentUpload.objects.get(pk=upload_id)
+        depth = len(connection.atomic_blocks)
+        seen = []
+
+        class Body(io.BytesIO):
+            def read(self, size=-1):
+                seen.append(len(connection.atomic_blocks))
+                # A concurrent retry stores the same chunk while this one is still being read.
+                AttachmentUpload.objects.filter(pk=upload_id).update(offset=1000)
+                return super().read(size)
+
+        chunk = b"x" * 400
+        with self.assertRaises(OffsetMismatch):
+            write_chunk(upload.pk, self.user, 600, 400, hashlib.sha256(chunk).hexdigest(), Body(chunk))
+        self.assertEqual(set(seen), {depth})
+        with open(partial_path(upload), "rb") as f:
+            self.assertEqual(f.read(), payload[:600])
+        self.assertEqual(os.listdir(os.path.dirname(partial_path(upload))), [os.path.basename(partial_path(upload))])
+
+    def test_missing_partial_file_is_gone_not_an_error(self):
+        payload = os.urandom(1000)
+        upload_id = self.start(payload, content_type="application/pdf", filename="invoice.pdf")
+        self.put(upload_id, payload[:600], 0)
+        os.remove(partial_path(AttachmentUpload(id=uuid.UUID(upload_id))))
+        self.assertEqual(self.put(upload_id, payload[600:], 600).status_code, 410)
+
+    def test_uploads_are_private(self):
+        upload_id = self.start(b"abc")
+        other = User.objects.create_user(phone="+37121000012", password="StrongPass123")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.put(upload_id, b"abc", 0).status_code, 404)
+        r = self.client.post("/api/cases/uploads/", {
+            "case": self.case.id, "filename": "x.png", "content_type": "image/png", "size": 3,
+        }, format="json")
+        self.assertEqual(r.status_code, 400)
+
+    def test_attach_to_message_and_thumbnail_off_request(self):
+        payload = self.png()
+        r = self.put(self.start(payload), payload, 0)
+        attachment_id = r.data["attachment"]["id"]
+        self.assertEqual(r.data["attachment"]["thumbnail_status"], "pending")
+
+        r = self.client.post("/api/cases/messages/", {
+            "case": self.case.id, "message": "see photo", "attachment_ids": [attachment_id],
+        }, format="json")
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual([a["id"] for a in r.data["attachments"]], [attachment_id])
+
+        self.assertEqual(process_pending(), 1)
+        attachment = CaseAttachment.objects.get(pk=attachment_id)
+        self.assertEqual(attachment.thumbnail_status, "done")
+        with Image.open(attachment.thumbnail.path) as thumb:
+            self.assertLessEqual(max(thumb.size), 400)
+
+        r = self.client.get(f"/api/cases/cases/{self.case.id}/")
+        self.assertTrue(r.data["messages"][0]["attachments"][0]["thumbnail"])
+
+        thumb = self.client.get(r.data["messages"][0]["attachments"][0]["thumbnail"])
+        self.assertEqual((thumb.status_code, thumb["Content-Type"]), (200, "image/jpeg"))
+        self.assertTrue(b"".join(thumb.streaming_content).startswith(b"\xff\xd8"))
+
+        # An attachment belongs to exactly one message.
+        r = self.client.post("/api/cases/messages/", {
+            "case": self.case.id, "message": "again", "attachment_ids": [attachment_id],
+        }, format="json")
+        self.assertEqual(r.status_code, 400)
+
+    def test_files_are_served_privately_with_the_validated_type(self):
+        payload = b"<script>alert(1)</script>"
+        r = self.put(self.start(payload, filename="x.html"), payload, 0)
+        attachment = CaseAttachment.objects.get(pk=r.data["attachment"]["id"])
+        self.assertTrue(attachment.file.path.startswith(os.path.realpath(self.media)))
+        self.assertEqual(os.path.splitext(attachment.file.name)[1], ".png")
+        url = r.data["attachment"]["file"]
+        self.assertEqual(url, f"http://localhost:8000/api/cases/attachments/{attachment.pk}/download/")
+
+        r = self.client.get(url, HTTP_ACCEPT="image/png")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(b"".join(r.streaming_content), payload)
+        self.assertEqual(r["Content-Type"], "image/png")
+        self.assertEqual(r["Content-Disposition"], 'attachment; filename="x.png"')
+        self.assertEqual(r["X-Content-Type-Options"], "nosniff")
+
+        with override_settings(ATTACHMENT_ACCEL_PREFIX="/protected-attachments/"):
+            r = self.client.get(url)
+        self.assertEqual(r["X-Accel-Redirect"], f"/protected-attachments/{attachment.file.name}")
+        self.assertEqual(r.content, b"")
+
+        other = User.objects.create_user(phone="+37121000012", password="StrongPass123")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+    def test_events_and_rest_share_attachment_urls(self):
+        r = self.put(self.start(b"abc"), b"abc", 0)
+        r = self.client.post("/api/cases/messages/", {
+            "case": self.case.id, "message": "see photo", "attachment_ids": [r.data["attachment"]["id"]],
+        }, format="json")
+        [event] = load_events(ids=[r.data["id"]])
+        self.assertEqual(orjson.loads(event["data"])["attachments"], r.data["attachments"])
+
+    def test_internal_attachments_are_hidden_from_the_owner(self):
+        staff = User.objects.create_user(phone="+37121000012", password="StrongPass123", is_superuser=True)
+        self.client.force_authenticate(staff)
+        r = self.put(self.start(b"abc"), b"abc", 0)
+        attachment_id = r.data["attachment"]["id"]
+        url = f"/api/cases/attachments/{attachment_id}/download/"
+        self.client.post("/api/cases/messages/", {
+            "case": self.case.id, "message": "note", "is_internal": True, "attachment_ids": [attachment_id],
+        }, format="json")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class CaseDashboardTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(phone="+37121000013", password="StrongPass123", is_staff=True)
+        self.user = User.objects.create_user(phone="+37121000014", password="StrongPass123")
+        self.boiler = Equipment.objects.create(user=self.user, name="Boiler", manufacturer="Vaillant")
+        self.pump = Equipment.objects.create(user=self.user, name="Pump", manufacturer="Grundfos")
+        self.a = PlumbingCase.objects.create(user=self.user, title="A", equipment=self.boiler)
+        self.b = PlumbingCase.objects.create(user=self.user, title="B", equipment=self.pump, priority="high")
+        self.c = PlumbingCase.objects.create(user=self.user, title="C")
+        old = PlumbingCase.objects.create(user=self.user, title="Old", status="scheduled")
+        PlumbingCase.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+        rebuild_case_rollups()
+        self.client.force_authenticate(self.staff)
+
+    def get(self):
+        with self.assertNumQueries(1):
+            r = self.client.get("/api/cases/dashboard/")
+        self.assertEqual(r.status_code, 200)
+        return r.data
+
+    def test_dashboard_counts_open_cases(self):
+        data = self.get()
+        self.assertEqual(data["open_total"], 4)
+        self.assertEqual(data["by_status"], {"new": 3, "scheduled": 1})
+        self.assertEqual(data["by_priority"], {"normal": 3, "high": 1})
+        self.assertEqual(data["by_age"], {"0-1d": 3, "2-7d": 0, "8-30d": 0, "31d+": 1})
+        self.assertEqual(data["by_manufacturer"], {"Vaillant": 1, "Grundfos": 1, "unknown": 2})
+
+    def test_rollup_follows_case_and_equipment_changes(self):
+        self.a.status = "done"
+        self.a.save()
+        self.b.status = "in_progress"
+        self.b.save()
+        self.c.equipment = self.boiler
+        self.c.save()
+        self.pump.manufacturer = "Wilo"
+        self.pump.save()
+        PlumbingCase.objects.create(user=self.user, title="D", equipment=self.pump)
+        self.boiler.delete()
+        incremental = self.get()
+        self.assertEqual(incremental["by_status"], {"new": 2, "in_progress": 1, "scheduled": 1})
+        self.assertEqual(incremental["by_manufacturer"], {"Wilo": 2, "unknown": 2})
+        rebuild_case_rollups()
+        self.assertEqual(self.get(), incremental)
+
+    def test_dashboard_is_staff_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/api/cases/dashboard/").status_code, 403)
@@ -0,0 +1,200 @@
+"""Chunked, resumable attachment uploads and off-request thumbnails.
+
+Chunks are appended in order to ``ATTACHMENT_ROOT/uploads-partial/<id>.part``.
+Each one is first streamed from the request in fixed-size blocks into an
+anonymous temporary file and checked against the client's SHA-256, with no
+transaction or row lock held, so a slow client only ties up its own request
+and a worker never holds more than one block in memory. Only then is the
+upload row locked, briefly, to copy the chunk in at the current offset; if
+another request got there first, the staged copy is dropped. The finished
+file is hard-linked into place (same filesystem, no copy) and the partial file
+is only removed once the attachment row has committed, so a rollback leaves a
+resumable upload behind. Thumbnails are made later by ``manage.py process_attachments``.
+"""
+import hashlib
+import io
+import mimetypes
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import AttachmentUpload, CaseAttachment
+from .storage import attachment_storage
+
+BLOCK_SIZE = 64 * 1024
+PARTIAL_DIR = "uploads-partial"
+
+
+class OffsetMismatch(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Chunk does not start at the current upload offset."
+    default_code = "offset_mismatch"
+
+
+class UploadGone(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The uploaded data is gone; start a new upload."
+    default_code = "upload_gone"
+
+
+def partial_path(upload) -> str:
+    return attachment_storage.path(f"{PARTIAL_DIR}/{upload.id.hex}.part")
+
+
+def extension_for(content_type) -> str:
+    """File extension for a validated content type; the client's filename never picks it."""
+    return mimetypes.guess_extension(content_type.split(";")[0].strip().lower()) or ".bin"
+
+
+def _attachment_name(upload) -> str:
+    return f"case-attachments/{upload.case_id}/{upload.id.hex}{extension_for(upload.content_type)}"
+
+
+def _copy_block(stream, out, digest, length):
+    remaining = length
+    while remaining:
+        block = stream.read(min(BLOCK_SIZE, remaining))
+        if not block:
+            raise ValidationError({"detail": "Request body is shorter than Content-Length."})
+        digest.update(block)
+        out.write(block)
+        remaining -= len(block)
+
+
+def _check_chunk(upload, offset, length):
+    if offset != upload.offset:
+        raise OffsetMismatch({"detail": OffsetMismatch.default_detail, "offset": upload.offset})
+    if length <= 0 or length > settings.ATTACHMENT_CHUNK_MAX or offset + length > upload.size:
+        raise ValidationError({"detail": "Invalid chunk length."})
+
+
+def _stage_chunk(stream, length, checksum, directory):
+    """The verified chunk in an anonymous temporary file, rewound; it vanishes when closed."""
+    staged = tempfile.TemporaryFile(dir=directory)
+    try:
+        digest = hashlib.sha256()
+        _copy_block(stream, staged, digest, length)
+        if digest.hexdigest() != checksum.lower():
+            raise ValidationError({"detail": "Chunk checksum mismatch."})
+    except BaseException:
+        staged.close()
+        raise
+    staged.seek(0)
+    return staged
+
+
+def write_chunk(upload_id, user, offset, length, checksum, stream):
+    """Append ``length`` bytes from ``stream`` at ``offset``; returns the upload, or the attachment once complete."""
+    # Refuse a stale offset before reading the body.
+    upload = AttachmentUpload.objects.get(pk=upload_id, user=user)
+    _check_chunk(upload, offset, length)
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _stage_chunk(stream, length, checksum, os.path.dirname(path)) as staged, transaction.atomic():
+        upload = AttachmentUpload.objects.select_for_update().get(pk=upload_id, user=user)
+        # A concurrent retry may have stored this chunk while we were reading it.
+        _check_chunk(upload, offset, length)
+        try:
+            out = open(path, "r+b" if offset else "wb")
+        except FileNotFoundError:
+            raise UploadGone()
+        with out:
+            out.seek(offset)
+            try:
+                shutil.copyfileobj(staged, out, BLOCK_SIZE)
+                out.flush()
+                os.fsync(out.fileno())
+            except Exception:
+                out.truncate(offset)
+                raise
+        upload.offset = offset + length
+        if upload.offset < upload.size:
+            upload.save(update_fields=["offset", "updated_at"])
+            return upload
+        return _complete(upload)
+
+
+def _remove(path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _complete(upload):
+    name = _attachment_name(upload)
+    source = partial_path(upload)
+    target = attachment_storage.path(name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # Left over from an attempt whose transaction never committed.
+    _remove(target)
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        raise UploadGone()
+    try:
+        attachment = CaseAttachment.objects.create(
+            case_id=upload.case_id,
+            uploaded_by_id=upload.user_id,
+            file=name,
+            filename=upload.filename,
+            content_type=upload.content_type,
+            size=upload.size,
+            thumbnail_status="pending" if upload.content_type.startswith("image/") else "skipped",
+        )
+        upload.delete()
+    except Exception:
+        _remove(target)
+        raise
+    transaction.on_commit(lambda: _remove(source))
+    return attachment
+
+
+def discard_upload(upload) -> None:
+    _remove(partial_path(upload))
+    # A link left by a completion whose transaction failed to commit.
+    _remove(attachment_storage.path(_attachment_name(upload)))
+    upload.delete()
+
+
+def purge_stale_uploads() -> int:
+    cutoff = timezone.now() - timedelta(hours=settings.ATTACHMENT_UPLOAD_TTL_HOURS)
+    stale = list(AttachmentUpload.objects.filter(updated_at__lt=cutoff))
+    for upload in stale:
+        discard_upload(upload)
+    return len(stale)
+
+
+def make_thumbnail(attachment) -> None:
+    size = settings.ATTACHMENT_THUMBNAIL_SIZE
+    try:
+        with Image.open(attachment.file.path) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((size, size))
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, "JPEG", quality=80)
+    except (OSError, Image.DecompressionBombError):
+        attachment.thumbnail_status = "failed"
+    else:
+        stem = os.path.splitext(os.path.basename(attachment.file.name))[0]
+        name = f"{os.path.dirname(attachment.file.name)}/thumb-{stem}.jpg"
+        attachment.thumbnail.save(name, ContentFile(buffer.getvalue()), save=False)
+        attachment.thumbnail_status = "done"
+    attachment.save(update_fields=["thumbnail", "thumbnail_status"])
+
+
+def process_pending(batch_size=50) -> int:
+    """Generate thumbnails for up to ``batch_size`` pending attachments."""
+    pending = list(CaseAttachment.objects.filter(thumbnail_status="pending").order_by("id")[:batch_size])
+    for attachment in pending:
+        make_thumbnail(attachment)
+    return len(pending)
@@ -1,8 +1,16 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import EquipmentViewSet, PlumbingCaseViewSet, CaseMessageViewSet
+from .streams import case_events, staff_events
+from .views import AttachmentUploadViewSet, CaseAttachmentViewSet, case_dashboard, EquipmentViewSet, PlumbingCaseViewSet, CaseMessageViewSet
 
 router=DefaultRouter()
 router.register("equipment", EquipmentViewSet, basename="equipment")
 router.register("cases", PlumbingCaseViewSet, basename="cases")
 router.register("messages", CaseMessageViewSet, basename="messages")
-urlpatterns = router.urls
+router.register("uploads", AttachmentUploadViewSet, basename="uploads")
+router.register("attachments", CaseAttachmentViewSet, basename="attachments")
+urlpatterns = [
+    path("cases/<int:pk>/events/", case_events, name="case-events"),
+    path("events/", staff_events, name="case-staff-events"),
+    path("dashboard/", case_dashboard, name="case-dashboard"),
+] + router.urls
@@ -1,10 +1,39 @@
-from django.db.models import Prefetch
-from rest_framework import viewsets, permissions
-from .models import Equipment, PlumbingCase, CaseMessage
-from .serializers import EquipmentSerializer, PlumbingCaseSerializer, PlumbingCaseDetailSerializer, CaseMessageSerializer
+import os
+
+from django.db.models import Prefetch, Q
+from rest_framework import mixins, viewsets, permissions, status
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.response import Response
+from .models import AttachmentUpload, Equipment, PlumbingCase, CaseAttachment, CaseMessage
+from .serializers import (
+    AttachmentUploadSerializer, CaseAttachmentSerializer, CaseMessageSerializer, EquipmentSerializer,
+    PlumbingCaseDetailSerializer, PlumbingCaseSerializer,
+)
 from .permissions import IsOwnerOrSuperuser
+from .rollups import dashboard
+from .storage import serve
+from .summary import mark_read, with_unread_counts
+from .uploads import discard_upload, extension_for, write_chunk
+from config.fieldsets import SparseFieldsetViewMixin
+
+MESSAGES_PAGE_SIZE = 100
+MESSAGES_MAX_PAGE_SIZE = 500
+
+def _int_param(request, name, default):
+    raw = request.query_params.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+    if value < 0:
+        raise ValidationError({name: "Must not be negative."})
+    return value
 
-class EquipmentViewSet(viewsets.ModelViewSet):
+class EquipmentViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class=EquipmentSerializer
     permission_classes=[permissions.IsAuthenticated, IsOwnerOrSuperuser]
     def get_queryset(self):
@@ -12,23 +41,133 @@ class EquipmentViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class PlumbingCaseViewSet(viewsets.ModelViewSet):
+class PlumbingCaseViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     permission_classes=[permissions.IsAuthenticated, IsOwnerOrSuperuser]
     def get_queryset(self):
-        base = PlumbingCase.objects.select_related("equipment", "user").prefetch_related(
-            Prefetch("messages", queryset=CaseMessage.objects.select_related("sender").order_by("created_at"))
-        )
-        return base.order_by("-created_at") if self.request.user.is_superuser else base.filter(user=self.request.user).order_by("-created_at")
+        user = self.request.user
+        qs = PlumbingCase.objects.order_by("-created_at")
+        if not user.is_superuser:
+            qs = qs.filter(user=user)
+        if self.action in ("list", "retrieve"):
+            qs = with_unread_counts(qs, user)
+        if self.action == "retrieve":
+            # Visibility is decided in the prefetch query itself, so the
+            # serializer reads the prefetched list without re-filtering.
+            messages = CaseMessage.objects.select_related("sender").prefetch_related("attachments").order_by("created_at")
+            if not user.is_superuser:
+                messages = messages.filter(is_internal=False)
+            qs = qs.select_related("equipment").prefetch_related(
+                Prefetch("messages", queryset=messages, to_attr="visible_messages")
+            )
+        return qs
+    @action(detail=True, url_path="messages")
+    def messages_since(self, request, pk=None):
+        """Messages newer than ``?after=<message id>``, oldest first, plus the cursor to poll with next.
+
+        Pollers keep the returned ``cursor`` and send it back as ``after``, so each
+        poll reads only the delta through the (case, id) index.
+        """
+        case = self.get_object()
+        after = _int_param(request, "after", 0)
+        limit = min(_int_param(request, "limit", MESSAGES_PAGE_SIZE) or MESSAGES_PAGE_SIZE, MESSAGES_MAX_PAGE_SIZE)
+        qs = CaseMessage.objects.filter(case=case, id__gt=after).select_related("sender").prefetch_related("attachments").order_by("id")
+        if not request.user.is_superuser:
+            qs = qs.filter(is_internal=False)
+        rows = list(qs[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return Response({
+            "results": CaseMessageSerializer(rows, many=True, context=self.get_serializer_context()).data,
+            "cursor": rows[-1].id if rows else after,
+            "has_more": has_more,
+        })
+    @action(detail=True, methods=["post"])
+    def read(self, request, pk=None):
+        """Mark the thread as read up to its current ``message_count``."""
+        case = self.get_object()
+        mark_read(request.user.id, case.id, case.message_count)
+        return Response({"unread_count": 0})
     def get_serializer_class(self):
         return PlumbingCaseDetailSerializer if self.action=="retrieve" else PlumbingCaseSerializer
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class CaseMessageViewSet(viewsets.ModelViewSet):
+class CaseMessageViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class=CaseMessageSerializer
     permission_classes=[permissions.IsAuthenticated, IsOwnerOrSuperuser]
     def get_queryset(self):
-        qs = CaseMessage.objects.select_related("case","sender").all()
+        qs = CaseMessage.objects.select_related("case","sender").prefetch_related("attachments")
         return qs if self.request.user.is_superuser else qs.filter(case__user=self.request.user, is_internal=False)
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
+
+class AttachmentUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """Resumable uploads: create, then PUT chunks in order; GET reports the offset to resume from."""
+    serializer_class=AttachmentUploadSerializer
+    permission_classes=[permissions.IsAuthenticated]
+    def get_queryset(self):
+        return AttachmentUpload.objects.filter(user=self.request.user)
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+
+    @action(detail=True, methods=["put"])
+    def chunk(self, request, pk=None):
+        """Raw chunk body with ``Upload-Offset`` and ``X-Chunk-SHA256`` (hex) headers."""
+        upload = self.get_object()
+        checksum = request.headers.get("X-Chunk-SHA256", "")
+        if not checksum:
+            raise ValidationError({"X-Chunk-SHA256": "This header is required."})
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            raise ValidationError({"Upload-Offset": "Must be an integer."})
+        # request.stream reads the socket as we go; request.data would buffer the chunk.
+        result = write_chunk(upload.pk, request.user, offset, length, checksum, request.stream)
+        if isinstance(result, CaseAttachment):
+            data = CaseAttachmentSerializer(result, context=self.get_serializer_context()).data
+            return Response({"offset": result.size, "attachment": data}, status=status.HTTP_201_CREATED)
+        return Response({"offset": result.offset, "attachment": None})
+
+class _FileNegotiation(BaseContentNegotiation):
+    # The file's type is fixed; an image or PDF Accept header must not get a 406.
+    def select_parser(self, request, parsers):
+        return parsers[0]
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+class CaseAttachmentViewSet(viewsets.GenericViewSet):
+    """Authenticated downloads of attachment files, which have no public URL."""
+    permission_classes=[permissions.IsAuthenticated]
+    content_negotiation_class=_FileNegotiation
+    def get_queryset(self):
+        qs = CaseAttachment.objects.all()
+        user = self.request.user
+        if user.is_superuser:
+            return qs
+        # Owners see attachments of their non-internal messages, plus their own not yet posted uploads.
+        return qs.filter(case__user=user).filter(
+            Q(message__is_internal=False) | Q(message__isnull=True, uploaded_by=user)
+        )
+
+    @action(detail=True)
+    def download(self, request, pk=None):
+        attachment = self.get_object()
+        # The stored name carries the extension of the validated type; the
+        # download name does too, whatever the client called the file.
+        filename = os.path.splitext(attachment.filename)[0] + extension_for(attachment.content_type)
+        return serve(attachment.file.name, attachment.content_type, filename)
+
+    @action(detail=True)
+    def thumbnail(self, request, pk=None):
+        attachment = self.get_object()
+        # Thumbnails are JPEGs this app re-encoded, so they may be shown inline.
+        return serve(attachment.thumbnail.name, "image/jpeg", f"thumb-{attachment.pk}.jpg", as_attachment=False)
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def case_dashboard(request):
+    """Open-case counts for staff, read from the CaseRollup table only."""
+    return Response(dashboard())
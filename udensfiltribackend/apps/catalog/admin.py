@@ -1,31 +1,37 @@
 from django.contrib import admin
 
+from config.cache import bump_generation
 from .models import Category, Product, Service
 
 
 @admin.action(description="Mark selected products active")
 def mark_products_active(modeladmin, request, queryset):
     queryset.update(is_active=True)
+    bump_generation(Product)
 
 
 @admin.action(description="Mark selected products inactive")
 def mark_products_inactive(modeladmin, request, queryset):
     queryset.update(is_active=False)
+    bump_generation(Product)
 
 
 @admin.action(description="Mark selected services active")
 def mark_services_active(modeladmin, request, queryset):
     queryset.update(is_active=True)
+    bump_generation(Service)
 
 
 @admin.action(description="Mark selected services inactive")
 def mark_services_inactive(modeladmin, request, queryset):
     queryset.update(is_active=False)
+    bump_generation(Service)
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "slug")
+    list_display = ("name", "slug", "parent", "path")
+    list_select_related = ("parent",)
     search_fields = ("name", "slug")
     prepopulated_fields = {"slug": ("name",)}
 
@@ -0,0 +1,192 @@
+"""Streaming CSV/JSONL import and export of catalog tables.
+
+Import upserts fixed-size batches keyed on ``slug`` with one
+``INSERT ... ON CONFLICT (slug) DO UPDATE`` per batch, then refreshes the
+derived data (search vectors, group prices, cache generations) that per-row
+saves would otherwise maintain through signals. Export streams rows through a
+server-side cursor, so memory use does not grow with table size.
+"""
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F
+
+from config.cache import bump_generation
+from config.search import update_search_vector
+from .models import Category, Product, Service
+from .pricing import refresh_item_prices
+from .tree import compute_paths, rebuild_category_paths
+
+
+CATALOG_KINDS = {
+    "categories": (Category, ("slug", "name", "parent")),
+    "products": (Product, ("slug", "name", "description", "price_cents", "currency", "image_url", "is_active", "category")),
+    "services": (Service, ("slug", "name", "description", "base_price_cents", "currency", "is_active")),
+}
+FORMATS = ("csv", "jsonl")
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n"}
+
+
+class RowError(ValueError):
+    def __init__(self, line_no, message):
+        super().__init__(f"line {line_no}: {message}")
+
+
+def detect_format(path, fmt=None):
+    fmt = fmt or (path.rsplit(".", 1)[-1].lower() if "." in path else "")
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot tell the format of {path!r}; pass --format {'/'.join(FORMATS)}")
+    return fmt
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line_no, dict)`` pairs one at a time."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise RowError(line_no, f"invalid JSON ({exc.msg})") from exc
+        if not isinstance(row, dict):
+            raise RowError(line_no, "expected a JSON object")
+        yield line_no, row
+
+
+def _clean(field, raw):
+    if isinstance(field, models.BooleanField) and isinstance(raw, str):
+        lowered = raw.strip().lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+    if raw is None and not field.null:
+        raw = field.get_default()
+    return field.clean(raw, None)
+
+
+def _parse_row(model, columns, line_no, raw, category_ids):
+    values = {}
+    for name in columns:
+        value = raw.get(name)
+        if name == "category":
+            slug = (value or "").strip()
+            if slug and slug not in category_ids:
+                raise RowError(line_no, f"unknown category {slug!r}")
+            values["category_id"] = category_ids.get(slug) if slug else None
+            continue
+        if name == "parent":
+            continue  # linked by slug once every row of the file exists, see _link_parents
+        try:
+            values[name] = _clean(model._meta.get_field(name), value)
+        except ValidationError as exc:
+            raise RowError(line_no, f"{name}: {' '.join(exc.messages)}") from exc
+    return values
+
+
+def _link_parents(parents):
+    """Point each imported category at its parent slug; parents may come later in the file."""
+    ids = dict(Category.objects.values_list("slug", "id"))
+    linked = []
+    for slug, (line_no, parent) in parents.items():
+        if parent and parent not in ids:
+            raise RowError(line_no, f"unknown parent {parent!r}")
+        linked.append(Category(id=ids[slug], parent_id=ids[parent] if parent else None))
+    Category.objects.bulk_update(linked, ["parent"], batch_size=1000)
+    rows = list(Category.objects.values_list("id", "parent_id"))
+    placed = compute_paths(rows)
+    looped = {pk for pk, _ in rows if pk not in placed}
+    for slug, (line_no, parent) in parents.items():
+        if ids[slug] in looped:
+            raise RowError(line_no, f"parent {parent!r} would nest {slug!r} under itself")
+
+
+def _flush(kind, model, columns, batch):
+    model.objects.bulk_create(
+        [model(**values) for values in batch.values()],
+        update_conflicts=True,
+        unique_fields=["slug"],
+        update_fields=["category_id" if f == "category" else f for f in columns if f != "slug"],
+    )
+    if kind == "categories":
+        return
+    imported = model.objects.filter(slug__in=list(batch))
+    update_search_vector(imported, model.SEARCH_FIELDS)
+    ids = list(imported.values_list("id", flat=True))
+    refresh_item_prices(**{"product_ids" if kind == "products" else "service_ids": ids})
+
+
+@transaction.atomic
+def import_rows(kind, rows, batch_size=1000):
+    """Upsert ``(line_no, dict)`` rows into the ``kind`` table; return the row count.
+
+    A row only overwrites the columns it carries: missing columns keep their
+    current value on existing rows and take the model default on new ones.
+    Rows are batched per column set; within a batch the last row for a slug wins.
+    """
+    model, fields = CATALOG_KINDS[kind]
+    category_ids = dict(Category.objects.values_list("slug", "id")) if "category" in fields else {}
+    batches = {}
+    parents = {}
+    count = 0
+    for line_no, raw in rows:
+        columns = tuple(f for f in fields if f in raw)
+        if "slug" not in columns or "name" not in columns:
+            raise RowError(line_no, "slug and name are required")
+        values = _parse_row(model, columns, line_no, raw, category_ids)
+        if "parent" in columns:
+            parents[values["slug"]] = (line_no, (raw.get("parent") or "").strip())
+            columns = tuple(f for f in columns if f != "parent")
+        batch = batches.setdefault(columns, {})
+        batch.pop(values["slug"], None)
+        batch[values["slug"]] = values
+        count += 1
+        if len(batch) >= batch_size:
+            _flush(kind, model, columns, batches.pop(columns))
+    for columns, batch in batches.items():
+        _flush(kind, model, columns, batch)
+    if parents:
+        _link_parents(parents)
+    if kind == "categories":
+        rebuild_category_paths()
+    if count:
+        bump_generation(model)
+    return count
+
+
+def export_rows(kind, chunk_size=2000):
+    """Yield catalog rows as plain dicts in ``CATALOG_KINDS`` column order."""
+    model, fields = CATALOG_KINDS[kind]
+    # Foreign keys are written as the related row's slug.
+    relations = [f for f in fields if f in ("category", "parent")]
+    plain = [f for f in fields if f not in relations]
+    qs = model.objects.order_by("id").values(*plain, **{f"{f}_slug": F(f"{f}__slug") for f in relations})
+    for row in qs.iterator(chunk_size=chunk_size):
+        for f in relations:
+            row[f] = row.pop(f"{f}_slug") or ""
+        yield {f: row[f] for f in fields}
+
+
+def write_rows(stream, fmt, kind, rows):
+    fields = CATALOG_KINDS[kind][1]
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    for row in rows:
+        stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    return count
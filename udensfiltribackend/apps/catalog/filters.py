@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Value, When
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Category
+
+
+class CatalogFilterSerializer(serializers.Serializer):
+    category = serializers.SlugField(required=False)
+    min_price = serializers.IntegerField(min_value=0, required=False)
+    max_price = serializers.IntegerField(min_value=0, required=False)
+    currency = serializers.CharField(max_length=8, required=False)
+    is_active = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if "min_price" in attrs and "max_price" in attrs and attrs["min_price"] > attrs["max_price"]:
+            raise serializers.ValidationError({"max_price": "Must not be lower than min_price"})
+        return attrs
+
+
+class CatalogFilterBackend(BaseFilterBackend):
+    """Query-parameter filters for catalog viewsets.
+
+    The view names its price column in ``price_field``. Only staff may look at
+    inactive rows (``?is_active=false``); everyone else always gets active ones.
+    """
+
+    query_params = tuple(CatalogFilterSerializer().fields)
+
+    def get_params(self, request):
+        ser = CatalogFilterSerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+        params = dict(ser.validated_data)
+        if not request.user.is_staff:
+            params.pop("is_active", None)
+        return params
+
+    def filter_queryset(self, request, queryset, view, exclude=()):
+        params = {k: v for k, v in self.get_params(request).items() if k not in exclude}
+        queryset = queryset.filter(is_active=params.get("is_active", True))
+        if "category" in params and hasattr(queryset.model, "category"):
+            # A category matches its whole subtree: a prefix of the materialized path.
+            path = Category.objects.filter(slug=params["category"]).values_list("path", flat=True).first()
+            queryset = queryset.filter(category__path__startswith=path) if path else queryset.none()
+        if "currency" in params:
+            queryset = queryset.filter(currency=params["currency"].upper())
+        if "min_price" in params:
+            queryset = queryset.filter(**{f"{view.price_field}__gte": params["min_price"]})
+        if "max_price" in params:
+            queryset = queryset.filter(**{f"{view.price_field}__lte": params["max_price"]})
+        return queryset
+
+
+def price_buckets():
+    bounds = settings.CATALOG_PRICE_BUCKETS
+    return [{"min": lower, "max": upper} for lower, upper in zip(bounds, list(bounds[1:]) + [None])]
+
+
+def price_bucket_expression(field):
+    bounds = settings.CATALOG_PRICE_BUCKETS
+    whens = [When(**{f"{field}__lt": upper}, then=Value(i)) for i, upper in enumerate(bounds[1:])]
+    return Case(*whens, default=Value(len(bounds) - 1), output_field=IntegerField())
+
+
+def compute_facets(queryset, price_field):
+    """Category and price-bucket counts from one GROUP BY over ``queryset``."""
+    has_category = hasattr(queryset.model, "category")
+    group_by = ["category_id", "category__slug", "category__name"] if has_category else []
+    rows = (
+        queryset.order_by()
+        .annotate(price_bucket=price_bucket_expression(price_field))
+        .values(*group_by, "price_bucket")
+        .annotate(count=Count("id"))
+    )
+
+    buckets = price_buckets()
+    for bucket in buckets:
+        bucket["count"] = 0
+    categories = {}
+    for row in rows:
+        buckets[row["price_bucket"]]["count"] += row["count"]
+        if has_category:
+            entry = categories.setdefault(row["category_id"], {
+                "id": row["category_id"], "slug": row["category__slug"], "name": row["category__name"], "count": 0,
+            })
+            entry["count"] += row["count"]
+
+    facets = {"price_buckets": buckets}
+    if has_category:
+        facets["categories"] = sorted(categories.values(), key=lambda c: (c["name"] is None, c["name"] or ""))
+    return facets
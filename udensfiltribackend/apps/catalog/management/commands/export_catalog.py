@@ -0,0 +1,26 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.catalog.bulk import CATALOG_KINDS, FORMATS, detect_format, export_rows, write_rows
+
+
+class Command(BaseCommand):
+    help = "Stream categories, products or services to a CSV/JSONL file with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(CATALOG_KINDS))
+        parser.add_argument("path", nargs="?", default="-", help="File to write, or - for stdout (default)")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+
+    def handle(self, *args, kind, path, format=None, **options):
+        try:
+            fmt = detect_format(path, format) if path != "-" else (format or "jsonl")
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if path == "-":
+            count = write_rows(sys.stdout, fmt, kind, export_rows(kind))
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as stream:
+                count = write_rows(stream, fmt, kind, export_rows(kind))
+        self.stderr.write(f"Exported {count} {kind}")
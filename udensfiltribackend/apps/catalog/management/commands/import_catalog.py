@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.catalog.bulk import CATALOG_KINDS, FORMATS, RowError, detect_format, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = "Upsert categories, products or services from a CSV/JSONL file, keyed on slug."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(CATALOG_KINDS))
+        parser.add_argument("path", help="File to read, or - for stdin")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, kind, path, format=None, batch_size=1000, **options):
+        try:
+            fmt = detect_format(path, format) if path != "-" else (format or "jsonl")
+            if path == "-":
+                count = import_rows(kind, read_rows(sys.stdin, fmt), batch_size)
+            else:
+                with open(path, newline="", encoding="utf-8") as stream:
+                    count = import_rows(kind, read_rows(stream, fmt), batch_size)
+        except (RowError, ValueError, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(self.style.SUCCESS(f"Imported {count} {kind}"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.pricing import rebuild_group_prices
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed per-group catalog price table from GroupDiscount and catalog prices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=int, action="append", dest="groups", help="Only rebuild this group id (repeatable)")
+
+    def handle(self, *args, groups=None, **options):
+        count = rebuild_group_prices(groups)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} group price rows"))
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from config.db_operations import PostgresAddIndex
+from config.search import update_search_vector
+
+
+SEARCH_FIELDS = (
+    ("Product", (("name", "A"), ("description", "B"))),
+    ("Service", (("name", "A"), ("description", "B"))),
+)
+
+
+def populate_search_vectors(apps, schema_editor):
+    for model_name, weighted_fields in SEARCH_FIELDS:
+        update_search_vector(apps.get_model("catalog", model_name).objects.all(), weighted_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="service",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="catalog_product_search_gin"
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="service",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="catalog_service_search_gin"
+            ),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
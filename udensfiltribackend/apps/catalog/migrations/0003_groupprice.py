@@ -0,0 +1,100 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_group_prices(apps, schema_editor):
+    GroupDiscount = apps.get_model("accounts", "GroupDiscount")
+    GroupPrice = apps.get_model("catalog", "GroupPrice")
+    Product = apps.get_model("catalog", "Product")
+    Service = apps.get_model("catalog", "Service")
+
+    rows = []
+    for group_id, pct in GroupDiscount.objects.filter(is_active=True, percentage__gt=0).values_list("group_id", "percentage"):
+        for pk, price in Product.objects.values_list("id", "price_cents"):
+            rows.append(GroupPrice(group_id=group_id, product_id=pk, price_cents=price * (100 - pct) // 100, discount_percent=pct))
+        for pk, price in Service.objects.values_list("id", "base_price_cents"):
+            rows.append(GroupPrice(group_id=group_id, service_id=pk, price_cents=price * (100 - pct) // 100, discount_percent=pct))
+    GroupPrice.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_seed_default_user_groups"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("catalog", "0002_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GroupPrice",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("price_cents", models.PositiveIntegerField()),
+                ("discount_percent", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="catalog_prices",
+                        to="auth.group",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="group_prices",
+                        to="catalog.product",
+                    ),
+                ),
+                (
+                    "service",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="group_prices",
+                        to="catalog.service",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("group", "product"),
+                        name="catalog_groupprice_product_unique",
+                    ),
+                    models.UniqueConstraint(
+                        fields=("group", "service"),
+                        name="catalog_groupprice_service_unique",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(
+                                ("product__isnull", False), ("service__isnull", True)
+                            ),
+                            models.Q(
+                                ("product__isnull", True), ("service__isnull", False)
+                            ),
+                            _connector="OR",
+                        ),
+                        name="catalog_groupprice_one_item",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_group_prices, migrations.RunPython.noop),
+    ]
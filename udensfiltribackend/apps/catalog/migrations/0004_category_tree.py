@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from config.db_operations import PostgresAddIndex
+
+
+def populate_paths(apps, schema_editor):
+    # Frozen copy of apps.catalog.tree.rebuild_category_paths as of this migration.
+    Category = apps.get_model("catalog", "Category")
+    children = {}
+    for pk, parent_id in Category.objects.values_list("id", "parent_id"):
+        children.setdefault(parent_id, []).append(pk)
+    paths = {}
+    stack = [(pk, "") for pk in children.get(None, ())]
+    while stack:
+        pk, prefix = stack.pop()
+        paths[pk] = f"{prefix}{pk}/"
+        stack.extend((child, paths[pk]) for child in children.get(pk, ()))
+    Category.objects.bulk_update([Category(id=pk, path=path) for pk, path in paths.items()], ["path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0003_groupprice"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="children",
+                to="catalog.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="path",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=255
+            ),
+        ),
+        PostgresAddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["path"],
+                name="catalog_category_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
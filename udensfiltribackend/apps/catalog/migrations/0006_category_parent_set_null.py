@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="category",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="children",
+                to="catalog.category",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0006_category_parent_set_null"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="product",
+            name="catalog_product_active_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="service",
+            name="catalog_service_active_idx",
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["name", "id"],
+                name="catalog_product_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["name", "id"],
+                name="catalog_service_active_idx",
+            ),
+        ),
+    ]
@@ -1,11 +1,45 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 
 class Category(models.Model):
     name = models.CharField(max_length=120)
     slug = models.SlugField(max_length=140, unique=True)
+    # Deleting a category promotes its children to roots, like products fall back to no category.
+    parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="children")
+    # Ancestor ids down to this node, e.g. "3/7/12/"; a subtree is a prefix match.
+    path = models.CharField(max_length=255, blank=True, default="", editable=False)
+    class Meta:
+        indexes = [models.Index(fields=["path"], name="catalog_category_path_idx", opclasses=["varchar_pattern_ops"])]
     def __str__(self): return self.name
 
+    def _creates_cycle(self):
+        if not self.parent_id or not self.pk:
+            return False
+        return self.parent_id == self.pk or (bool(self.path) and self.parent.path.startswith(self.path))
+
+    def clean(self):
+        if self._creates_cycle():
+            raise ValidationError({"parent": "A category cannot be nested under itself or its descendants."})
+
+    def save(self, *args, **kwargs):
+        if self._creates_cycle():
+            raise ValueError("A category cannot be nested under itself or its descendants.")
+        super().save(*args, **kwargs)
+        path = f"{self.parent.path if self.parent_id else ''}{self.pk}/"
+        if path != self.path:
+            old, self.path = self.path, path
+            Category.objects.filter(pk=self.pk).update(path=path)
+            if old:
+                Category.objects.filter(path__startswith=old).exclude(pk=self.pk).update(
+                    path=Concat(Value(path), Substr("path", len(old) + 1))
+                )
+
 class Product(models.Model):
+    SEARCH_FIELDS = (("name", "A"), ("description", "B"))
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="products")
     name = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True)
@@ -14,13 +48,49 @@ class Product(models.Model):
     currency = models.CharField(max_length=8, default="EUR")
     image_url = models.URLField(blank=True, default="")
     is_active = models.BooleanField(default=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="catalog_product_search_gin"),
+            # Anonymous listing: WHERE is_active ORDER BY name, id (id breaks ties for the cursor's OFFSET).
+            models.Index(fields=["name", "id"], condition=models.Q(is_active=True), name="catalog_product_active_idx"),
+        ]
     def __str__(self): return self.name
 
 class Service(models.Model):
+    SEARCH_FIELDS = (("name", "A"), ("description", "B"))
     name = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True)
     description = models.TextField(blank=True, default="")
     base_price_cents = models.PositiveIntegerField(default=0)
     currency = models.CharField(max_length=8, default="EUR")
     is_active = models.BooleanField(default=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="catalog_service_search_gin"),
+            models.Index(fields=["name", "id"], condition=models.Q(is_active=True), name="catalog_service_active_idx"),
+        ]
     def __str__(self): return self.name
+
+class GroupPrice(models.Model):
+    """Discounted price of one product or service for one customer group.
+
+    Derived data: maintained by ``apps.catalog.pricing`` from ``GroupDiscount``
+    and the catalog prices, so reads never redo the discount math.
+    """
+    group = models.ForeignKey("auth.Group", on_delete=models.CASCADE, related_name="catalog_prices")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, null=True, blank=True, related_name="group_prices")
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, null=True, blank=True, related_name="group_prices")
+    price_cents = models.PositiveIntegerField()
+    discount_percent = models.PositiveSmallIntegerField(default=0)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["group", "product"], name="catalog_groupprice_product_unique"),
+            models.UniqueConstraint(fields=["group", "service"], name="catalog_groupprice_service_unique"),
+            models.CheckConstraint(
+                condition=models.Q(product__isnull=False, service__isnull=True) | models.Q(product__isnull=True, service__isnull=False),
+                name="catalog_groupprice_one_item",
+            ),
+        ]
+    def __str__(self): return f"{self.group_id}: {self.product_id or self.service_id} = {self.price_cents}"
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models import F, FilteredRelation, IntegerField, Q, Value
+from django.db.models.functions import Coalesce
+
+from apps.accounts.models import GroupDiscount
+from config.cache import bump_generation
+from .models import GroupPrice, Product, Service
+
+
+def discounted_price(base_cents: int, discount_pct: int) -> int:
+    if discount_pct <= 0:
+        return base_cents
+    return (base_cents * (100 - discount_pct)) // 100
+
+
+def pricing_group_for(user):
+    """``(group_id, percentage)`` of the user's best active group discount, or None."""
+    if not user or not user.is_authenticated:
+        return None
+    return (
+        GroupDiscount.objects.filter(group__user=user, is_active=True, percentage__gt=0)
+        .order_by("-percentage")
+        .values_list("group_id", "percentage")
+        .first()
+    )
+
+
+def _active_discounts(group_ids=None):
+    qs = GroupDiscount.objects.filter(is_active=True, percentage__gt=0)
+    if group_ids is not None:
+        qs = qs.filter(group_id__in=group_ids)
+    return list(qs.values_list("group_id", "percentage"))
+
+
+def _rows(discounts, products, services):
+    for group_id, pct in discounts:
+        for pk, price in products:
+            yield GroupPrice(group_id=group_id, product_id=pk, price_cents=discounted_price(price, pct), discount_percent=pct)
+        for pk, price in services:
+            yield GroupPrice(group_id=group_id, service_id=pk, price_cents=discounted_price(price, pct), discount_percent=pct)
+
+
+@transaction.atomic
+def rebuild_group_prices(group_ids=None) -> int:
+    """Recompute every price row of the given groups (all groups when None)."""
+    stale = GroupPrice.objects.all() if group_ids is None else GroupPrice.objects.filter(group_id__in=group_ids)
+    stale.delete()
+    products = Product.objects.values_list("id", "price_cents")
+    services = Service.objects.values_list("id", "base_price_cents")
+    created = GroupPrice.objects.bulk_create(_rows(_active_discounts(group_ids), products, services), batch_size=1000)
+    bump_generation(GroupPrice)
+    return len(created)
+
+
+@transaction.atomic
+def refresh_item_prices(product_ids=(), service_ids=()) -> int:
+    """Recompute the price rows of specific catalog items for every discounted group."""
+    GroupPrice.objects.filter(Q(product_id__in=product_ids) | Q(service_id__in=service_ids)).delete()
+    products = Product.objects.filter(id__in=product_ids).values_list("id", "price_cents")
+    services = Service.objects.filter(id__in=service_ids).values_list("id", "base_price_cents")
+    created = GroupPrice.objects.bulk_create(_rows(_active_discounts(), products, services), batch_size=1000)
+    bump_generation(GroupPrice)
+    return len(created)
+
+
+def with_customer_prices(queryset, price_field, pricing):
+    """Annotate ``customer_price_cents``/``discount_percent`` for a ``pricing_group_for`` result.
+
+    One LEFT JOIN on the price table; rows missing from it fall back to the same
+    formula so a lagging table never changes what a customer pays.
+    """
+    if pricing is None:
+        return queryset.annotate(customer_price_cents=F(price_field), discount_percent=Value(0, output_field=IntegerField()))
+    group_id, pct = pricing
+    return queryset.annotate(
+        group_price=FilteredRelation("group_prices", condition=Q(group_prices__group_id=group_id)),
+    ).annotate(
+        customer_price_cents=Coalesce(
+            F("group_price__price_cents"), F(price_field) * (100 - pct) / 100, output_field=IntegerField()
+        ),
+        discount_percent=Coalesce(F("group_price__discount_percent"), Value(pct), output_field=IntegerField()),
+    )
@@ -1,11 +1,16 @@
 from rest_framework import serializers
+from config.fieldsets import SparseFieldsetSerializerMixin
 from .models import Category, Product, Service
 
-class CategorySerializer(serializers.ModelSerializer):
-    class Meta: model=Category; fields=("id","name","slug")
+class CategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta: model=Category; fields=("id","name","slug","parent")
 
-class ProductSerializer(serializers.ModelSerializer):
-    class Meta: model=Product; fields=("id","name","slug","description","price_cents","currency","image_url","category","is_active")
+class ProductSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    customer_price_cents = serializers.IntegerField(read_only=True)
+    discount_percent = serializers.IntegerField(read_only=True)
+    class Meta: model=Product; fields=("id","name","slug","description","price_cents","customer_price_cents","discount_percent","currency","image_url","category","is_active")
 
-class ServiceSerializer(serializers.ModelSerializer):
-    class Meta: model=Service; fields=("id","name","slug","description","base_price_cents","currency","is_active")
+class ServiceSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    customer_price_cents = serializers.IntegerField(read_only=True)
+    discount_percent = serializers.IntegerField(read_only=True)
+    class Meta: model=Service; fields=("id","name","slug","description","base_price_cents","customer_price_cents","discount_percent","currency","is_active")
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import GroupDiscount
+from config.cache import bump_generation
+from config.search import refresh_search_vector
+from .models import Category, Product, Service
+from .pricing import rebuild_group_prices, refresh_item_prices
+from .tree import rebuild_category_paths
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def bump_catalog_generation(sender, **kwargs):
+    bump_generation(sender)
+
+
+post_save.connect(refresh_search_vector, sender=Product, dispatch_uid="catalog_product_search_vector")
+post_save.connect(refresh_search_vector, sender=Service, dispatch_uid="catalog_service_search_vector")
+
+
+@receiver(post_save, sender=GroupDiscount)
+@receiver(post_delete, sender=GroupDiscount)
+def rebuild_prices_for_group(sender, instance, **kwargs):
+    rebuild_group_prices([instance.group_id])
+
+
+@receiver(post_save, sender=Product)
+def refresh_product_prices(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "price_cents" in update_fields:
+        refresh_item_prices(product_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Service)
+def refresh_service_prices(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "base_price_cents" in update_fields:
+        refresh_item_prices(service_ids=[instance.pk])
+
+
+@receiver(post_delete, sender=Category)
+def reroot_orphaned_categories(sender, instance, **kwargs):
+    # SET_NULL detaches the children with an UPDATE that leaves their paths,
+    # and their descendants' paths, under the deleted id.
+    if instance.path and Category.objects.filter(path__startswith=instance.path).exists():
+        rebuild_category_paths()
@@ -0,0 +1,460 @@
+import csv
+import gzip
+import importlib
+import json
+import os
+import tempfile
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+import brotli
+
+from django.apps import apps
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.accounts.models import BUSINESS_USERS_GROUP, GroupDiscount, User
+from config.compression import CODECS, choose_encoding
+from config.fastpath import serialize_values, values_plan, values_queryset
+from config.query_plans import QueryPlanAssertions
+from .admin import ProductAdmin, mark_products_inactive
+from .models import Category, GroupPrice, Product, Service
+from .pricing import with_customer_prices
+from .serializers import ProductSerializer, ServiceSerializer
+
+
+class CatalogCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = Product.objects.create(name="Filter", slug="filter", price_cents=1000)
+
+    def test_repeated_list_is_served_from_cache(self):
+        r1 = self.client.get("/api/catalog/products/")
+        self.assertEqual(r1.status_code, 200)
+        with self.assertNumQueries(0):
+            r2 = self.client.get("/api/catalog/products/")
+        self.assertEqual(r1.data, r2.data)
+
+    def test_unknown_query_parameters_bypass_the_cache(self):
+        self.client.get("/api/catalog/products/")
+        keys = set(cache._cache)
+        for i in range(3):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.client.get("/api/catalog/products/", {"x": i}).status_code, 200)
+        self.assertEqual(set(cache._cache), keys)
+
+    def test_known_query_parameters_share_an_entry_in_any_order(self):
+        first = self.client.get("/api/catalog/products/?currency=eur&fields=id,slug")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/catalog/products/?fields=id,slug&currency=eur")
+        self.assertEqual((second.data, second["ETag"]), (first.data, first["ETag"]))
+
+    def test_save_invalidates_list_and_detail(self):
+        self.client.get("/api/catalog/products/")
+        self.client.get("/api/catalog/products/filter/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price_cents = 1500
+            self.product.save()
+        self.assertEqual(self.client.get("/api/catalog/products/").data["results"][0]["price_cents"], 1500)
+        self.assertEqual(self.client.get("/api/catalog/products/filter/").data["price_cents"], 1500)
+
+    def test_admin_bulk_action_invalidates_list(self):
+        self.assertEqual(len(self.client.get("/api/catalog/products/").data["results"]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_products_inactive(ProductAdmin(Product, AdminSite()), None, Product.objects.all())
+        self.assertEqual(self.client.get("/api/catalog/products/").data["results"], [])
+
+    def test_category_delete_invalidates_products(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Pumps", slug="pumps")
+            self.product.category = category
+            self.product.save()
+        self.assertEqual(self.client.get("/api/catalog/products/").data["results"][0]["category"], category.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            category.delete()
+        self.assertIsNone(self.client.get("/api/catalog/products/").data["results"][0]["category"])
+
+    def test_conditional_get_returns_304_until_catalog_changes(self):
+        r = self.client.get("/api/catalog/products/")
+        etag = r["ETag"]
+        r2 = self.client.get("/api/catalog/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r2.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name="Pump", slug="pump", price_cents=2000)
+        r3 = self.client.get("/api/catalog/products/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r3.status_code, 200)
+        self.assertEqual(len(r3.data["results"]), 2)
+
+
+class CatalogFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Product.objects.create(name="Filter", slug="filter", description="Long text", price_cents=1000)
+
+    def test_card_grid_fields_skip_description_column(self):
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/catalog/products/?fields=name,slug,customer_price_cents,image_url")
+        self.assertEqual(r.data["results"][0], {"name": "Filter", "slug": "filter", "customer_price_cents": 1000, "image_url": ""})
+        self.assertNotIn('"description"', ctx.captured_queries[-1]["sql"])
+        self.assertNotIn("description", self.client.get("/api/catalog/products/filter/?omit=description").data)
+
+
+class CatalogValuesPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Pumps", slug="pumps")
+        Product.objects.create(name="Pump", slug="pump", description="Quiet", price_cents=999, image_url="https://x.lv/p.png", category=category)
+        Product.objects.create(name="Hose", slug="hose", price_cents=150, is_active=False)
+        Service.objects.create(name="Install", slug="install", base_price_cents=5000)
+
+    def assert_parity(self, serializer_class, queryset):
+        plan = values_plan(serializer_class())
+        self.assertIsNotNone(plan)
+        self.assertEqual(serialize_values(values_queryset(queryset, plan), plan), serializer_class(queryset, many=True).data)
+
+    def test_values_rows_match_serializers(self):
+        self.assert_parity(ProductSerializer, with_customer_prices(Product.objects.order_by("name"), "price_cents", None))
+        self.assert_parity(ProductSerializer, with_customer_prices(Product.objects.order_by("name"), "price_cents", (1, 15)))
+        self.assert_parity(ServiceSerializer, with_customer_prices(Service.objects.order_by("name"), "base_price_cents", None))
+
+    def test_list_endpoint_matches_serializer(self):
+        expected = ProductSerializer(with_customer_prices(Product.objects.filter(is_active=True), "price_cents", None), many=True).data
+        self.assertEqual(APIClient().get("/api/catalog/products/").data["results"], expected)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for i in range(20):
+            Product.objects.create(name=f"Filter {i}", slug=f"filter-{i}", description="Carbon block cartridge. " * 10)
+
+    def test_negotiates_brotli_then_gzip(self):
+        plain = self.client.get("/api/catalog/products/")
+        self.assertNotIn("Content-Encoding", plain)
+        br = self.client.get("/api/catalog/products/", HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        self.assertEqual(br["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(br.content), plain.content)
+        self.assertIn("Accept-Encoding", br["Vary"])
+        self.assertTrue(br["ETag"].startswith('W/"'))
+        gz = self.client.get("/api/catalog/products/", HTTP_ACCEPT_ENCODING="br;q=0.5, gzip")
+        self.assertEqual(gz["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(gz.content), plain.content)
+        self.assertEqual(self.client.get("/api/catalog/products/", HTTP_ACCEPT_ENCODING="br", HTTP_IF_NONE_MATCH=br["ETag"]).status_code, 304)
+
+    def test_small_and_unaccepted_responses_are_left_alone(self):
+        self.assertNotIn("Content-Encoding", self.client.get("/api/catalog/categories/", HTTP_ACCEPT_ENCODING="br"))
+        self.assertNotIn("Content-Encoding", self.client.get("/api/catalog/products/", HTTP_ACCEPT_ENCODING="identity, *;q=0"))
+        self.assertEqual(choose_encoding("*"), "br")
+        self.assertIsNone(choose_encoding(""))
+
+    def test_cached_payload_is_compressed_once(self):
+        compress = Mock(wraps=CODECS["br"])
+        with patch.dict(CODECS, {"br": compress}):
+            first = self.client.get("/api/catalog/products/", HTTP_ACCEPT_ENCODING="br")
+            second = self.client.get("/api/catalog/products/", HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_browsable_api_html_is_not_shared_between_users(self):
+        user = User.objects.create_user(phone="+37120000099", password="StrongPass123")
+        member = APIClient()
+        member.force_authenticate(user)
+        anonymous = APIClient()
+        headers = {"HTTP_ACCEPT": "text/html", "HTTP_ACCEPT_ENCODING": "br"}
+        own = member.get("/api/catalog/products/", **headers)
+        self.assertEqual(own["Content-Encoding"], "br")
+        self.assertIn(b"+37120000099", brotli.decompress(own.content))
+        other = anonymous.get("/api/catalog/products/", **headers)
+        self.assertEqual(other["Content-Encoding"], "br")
+        self.assertNotIn(b"+37120000099", brotli.decompress(other.content))
+
+
+class CategoryTreeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.water = Category.objects.create(name="Water", slug="water")
+        self.filters = Category.objects.create(name="Filters", slug="filters", parent=self.water)
+        self.carbon = Category.objects.create(name="Carbon", slug="carbon", parent=self.filters)
+        self.pumps = Category.objects.create(name="Pumps", slug="pumps")
+        Product.objects.create(name="Jug", slug="jug", category=self.filters)
+        Product.objects.create(name="Block", slug="block", category=self.carbon)
+        Product.objects.create(name="Old block", slug="old-block", category=self.carbon, is_active=False)
+
+    def test_migration_backfill_matches_saved_paths(self):
+        expected = dict(Category.objects.values_list("id", "path"))
+        Category.objects.update(path="")
+        importlib.import_module("apps.catalog.migrations.0004_category_tree").populate_paths(apps, None)
+        self.assertEqual(dict(Category.objects.values_list("id", "path")), expected)
+
+    def test_paths_follow_moves(self):
+        self.assertEqual(self.carbon.path, f"{self.water.id}/{self.filters.id}/{self.carbon.id}/")
+        self.filters.parent = self.pumps
+        self.filters.save()
+        self.carbon.refresh_from_db()
+        self.assertEqual(self.carbon.path, f"{self.pumps.id}/{self.filters.id}/{self.carbon.id}/")
+        self.water.parent = self.carbon
+        self.water.save()  # not a descendant: allowed
+        self.filters.parent = self.water
+        with self.assertRaises(ValueError):
+            self.filters.save()
+
+    def test_deleting_a_category_promotes_its_children(self):
+        self.filters.delete()
+        self.carbon.refresh_from_db()
+        self.assertIsNone(self.carbon.parent_id)
+        self.assertEqual(self.carbon.path, f"{self.carbon.id}/")
+        self.assertEqual(Product.objects.get(slug="block").category, self.carbon)
+        Category.objects.filter(pk__in=[self.water.pk, self.carbon.pk]).delete()
+        self.assertEqual(Category.objects.get().path, f"{self.pumps.id}/")
+
+    def test_tree_counts_active_products_per_subtree_and_is_cached(self):
+        with self.assertNumQueries(1):
+            tree = self.client.get("/api/catalog/categories/tree/").data
+        self.assertEqual([n["slug"] for n in tree], ["pumps", "water"])
+        water = tree[1]
+        self.assertEqual((water["product_count"], water["total_product_count"]), (0, 2))
+        filters = water["children"][0]
+        self.assertEqual((filters["product_count"], filters["total_product_count"]), (1, 2))
+        self.assertEqual(filters["children"][0]["total_product_count"], 1)
+        with self.assertNumQueries(0):
+            self.client.get("/api/catalog/categories/tree/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name="Cartridge", slug="cartridge", category=self.carbon)
+        self.assertEqual(self.client.get("/api/catalog/categories/tree/").data[1]["total_product_count"], 3)
+
+    def test_category_filter_includes_subcategories(self):
+        r = self.client.get("/api/catalog/products/?category=water")
+        self.assertEqual(sorted(p["slug"] for p in r.data["results"]), ["block", "jug"])
+        self.assertEqual(self.client.get("/api/catalog/products/?category=missing").data["results"], [])
+
+
+class CatalogFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.pumps = Category.objects.create(name="Pumps", slug="pumps")
+        self.filters = Category.objects.create(name="Filters", slug="filters")
+        Product.objects.create(name="Small pump", slug="small-pump", category=self.pumps, price_cents=900)
+        Product.objects.create(name="Big pump", slug="big-pump", category=self.pumps, price_cents=30000)
+        Product.objects.create(name="Cartridge", slug="cartridge", category=self.filters, price_cents=1200)
+        Product.objects.create(name="USD cartridge", slug="usd-cartridge", category=self.filters, price_cents=1200, currency="USD")
+        Product.objects.create(name="Retired", slug="retired", category=self.filters, price_cents=100, is_active=False)
+
+    def slugs(self, params):
+        r = self.client.get("/api/catalog/products/", params)
+        self.assertEqual(r.status_code, 200)
+        return [p["slug"] for p in r.data["results"]]
+
+    def test_filters_by_category_price_and_currency(self):
+        self.assertEqual(self.slugs({"category": "pumps"}), ["big-pump", "small-pump"])
+        self.assertEqual(self.slugs({"min_price": 1000, "max_price": 5000}), ["cartridge", "usd-cartridge"])
+        self.assertEqual(self.slugs({"currency": "usd"}), ["usd-cartridge"])
+
+    def test_pages_through_equal_names_without_repeats(self):
+        for i in range(7):
+            Product.objects.create(name="Cartridge", slug=f"cartridge-{i}", category=self.filters, price_cents=1200)
+        seen = []
+        url, params = "/api/catalog/products/", {"page_size": 2}
+        while url:
+            r = self.client.get(url, params)
+            seen += [p["slug"] for p in r.data["results"]]
+            url, params = r.data["next"], None
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), Product.objects.filter(is_active=True).count())
+
+    def test_inactive_products_are_staff_only(self):
+        self.assertNotIn("retired", self.slugs({"is_active": "false"}))
+        staff = User.objects.create_user(phone="+37123000000", password="StrongPass123", is_staff=True)
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.slugs({"is_active": "false"}), ["retired"])
+
+    def test_invalid_price_range_is_rejected(self):
+        r = self.client.get("/api/catalog/products/", {"min_price": 500, "max_price": 100})
+        self.assertEqual(r.status_code, 400)
+
+    def test_facets_use_one_grouped_query_and_are_cached(self):
+        with self.assertNumQueries(1):
+            r = self.client.get("/api/catalog/products/facets/", {"currency": "EUR"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(
+            [(c["slug"], c["count"]) for c in r.data["categories"]],
+            [("filters", 1), ("pumps", 2)],
+        )
+        self.assertEqual(
+            [(b["min"], b["count"]) for b in r.data["price_buckets"]],
+            [(0, 1), (1000, 1), (2500, 0), (5000, 0), (10000, 0), (25000, 1)],
+        )
+        with self.assertNumQueries(0):
+            self.client.get("/api/catalog/products/facets/", {"currency": "EUR"})
+
+    def test_service_facets_have_price_buckets_only(self):
+        Service.objects.create(name="Install", slug="install", base_price_cents=4000)
+        r = self.client.get("/api/catalog/services/facets/")
+        self.assertNotIn("categories", r.data)
+        self.assertEqual(r.data["price_buckets"][2]["count"], 1)
+
+
+class GroupPriceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.group = Group.objects.get(name=BUSINESS_USERS_GROUP)
+        with self.captureOnCommitCallbacks(execute=True):
+            GroupDiscount.objects.update_or_create(group=self.group, defaults={"percentage": 20, "is_active": True})
+            self.product = Product.objects.create(name="Pump", slug="pump", price_cents=1000)
+        self.user = User.objects.create_user(phone="+37123000001", password="StrongPass123")
+        self.user.groups.add(self.group)
+
+    def price_row(self):
+        return GroupPrice.objects.get(group=self.group, product=self.product)
+
+    def test_rows_follow_product_price_and_discount_changes(self):
+        self.assertEqual((self.price_row().price_cents, self.price_row().discount_percent), (800, 20))
+        self.product.price_cents = 2000
+        self.product.save(update_fields=["price_cents"])
+        self.assertEqual(self.price_row().price_cents, 1600)
+        GroupDiscount.objects.filter(group=self.group).update(percentage=50)
+        GroupDiscount.objects.get(group=self.group).save()
+        self.assertEqual(self.price_row().price_cents, 1000)
+        GroupDiscount.objects.filter(group=self.group).get().delete()
+        self.assertFalse(GroupPrice.objects.filter(group=self.group).exists())
+
+    def test_listing_shows_group_price_for_members_only(self):
+        anonymous = self.client.get("/api/catalog/products/").data["results"][0]
+        self.assertEqual((anonymous["customer_price_cents"], anonymous["discount_percent"]), (1000, 0))
+        self.client.force_authenticate(self.user)
+        member = self.client.get("/api/catalog/products/").data["results"][0]
+        self.assertEqual((member["customer_price_cents"], member["discount_percent"]), (800, 20))
+
+    def test_price_table_change_invalidates_member_listing(self):
+        self.client.force_authenticate(self.user)
+        self.client.get("/api/catalog/products/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price_cents = 500
+            self.product.save()
+        self.assertEqual(self.client.get("/api/catalog/products/").data["results"][0]["customer_price_cents"], 400)
+
+
+class CatalogBulkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.group = Group.objects.get(name=BUSINESS_USERS_GROUP)
+        GroupDiscount.objects.update_or_create(group=self.group, defaults={"percentage": 10, "is_active": True})
+        self.category = Category.objects.create(name="Pumps", slug="pumps")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        return path
+
+    def test_csv_import_upserts_by_slug_and_refreshes_derived_data(self):
+        Product.objects.create(name="Old", slug="p1", price_cents=100, description="keep")
+        self.client.get("/api/catalog/products/")
+        path = self.write(
+            "products.csv",
+            "slug,name,price_cents,is_active,category\n"
+            "p1,Pressure pump,2000,true,pumps\n"
+            "p2,Filter,500,false,\n"
+            "p3,Valve,300,1,pumps\n",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_catalog", "products", path, batch_size=2, stdout=open(os.devnull, "w"))
+        p1 = Product.objects.get(slug="p1")
+        self.assertEqual((p1.name, p1.price_cents, p1.description, p1.category_id), ("Pressure pump", 2000, "keep", self.category.id))
+        self.assertFalse(Product.objects.get(slug="p2").is_active)
+        self.assertEqual(GroupPrice.objects.get(group=self.group, product=p1).price_cents, 1800)
+        self.assertEqual(GroupPrice.objects.filter(product__slug__in=["p1", "p2", "p3"]).count(), 3)
+        names = [r["name"] for r in self.client.get("/api/catalog/products/").data["results"]]
+        self.assertEqual(names, ["Pressure pump", "Valve"])
+        if connection.vendor == "postgresql":
+            self.assertIsNotNone(Product.objects.get(slug="p3").search_vector)
+
+    def test_category_import_sets_tree_paths(self):
+        path = self.write("categories.csv", "slug,name\nvalves,Valves\n")
+        call_command("import_catalog", "categories", path, stdout=open(os.devnull, "w"))
+        valves = Category.objects.get(slug="valves")
+        self.assertEqual(valves.path, f"{valves.id}/")
+
+    def test_category_tree_round_trips(self):
+        valves = Category.objects.create(name="Valves", slug="valves", parent=self.category)
+        Category.objects.create(name="Ball valves", slug="ball-valves", parent=valves)
+        path = os.path.join(self.tmp.name, "categories.csv")
+        call_command("export_catalog", "categories", path, stderr=open(os.devnull, "w"))
+        with open(path, encoding="utf-8") as fh:
+            rows = list(csv.DictReader(fh))
+        self.assertEqual([(r["slug"], r["parent"]) for r in rows], [("pumps", ""), ("valves", "pumps"), ("ball-valves", "valves")])
+        # Children listed before their parents still resolve.
+        reordered = self.write("reordered.csv", "slug,name,parent\nball-valves,Ball valves,valves\nvalves,Valves,pumps\n")
+        Category.objects.exclude(pk=self.category.pk).update(parent=None)
+        call_command("import_catalog", "categories", reordered, stdout=open(os.devnull, "w"))
+        ball = Category.objects.get(slug="ball-valves")
+        self.assertEqual(ball.path, f"{self.category.id}/{valves.id}/{ball.id}/")
+
+    def test_category_import_rejects_unknown_and_cyclic_parents(self):
+        path = self.write("bad.csv", "slug,name,parent\nvalves,Valves,nope\n")
+        with self.assertRaisesMessage(CommandError, "line 2: unknown parent 'nope'"):
+            call_command("import_catalog", "categories", path)
+        path = self.write("loop.csv", "slug,name,parent\na,A,b\nb,B,a\n")
+        with self.assertRaisesMessage(CommandError, "would nest"):
+            call_command("import_catalog", "categories", path)
+        self.assertFalse(Category.objects.filter(slug__in=["valves", "a", "b"]).exists())
+
+    def test_invalid_row_rolls_back_import(self):
+        path = self.write("services.jsonl", '{"slug": "s1", "name": "Repair"}\n{"slug": "s2", "name": "X", "base_price_cents": "abc"}\n')
+        with self.assertRaisesMessage(CommandError, "line 2: base_price_cents"):
+            call_command("import_catalog", "services", path, batch_size=1)
+        self.assertFalse(Service.objects.exists())
+
+    def test_export_round_trips_through_import(self):
+        Product.objects.create(name="Pump", slug="pump", price_cents=1000, category=self.category)
+        Product.objects.create(name="Hose", slug="hose", price_cents=200)
+        path = os.path.join(self.tmp.name, "products.jsonl")
+        call_command("export_catalog", "products", path, stderr=open(os.devnull, "w"))
+        with open(path, encoding="utf-8") as fh:
+            rows = [json.loads(line) for line in fh]
+        self.assertEqual([(r["slug"], r["category"]) for r in rows], [("pump", "pumps"), ("hose", "")])
+        Product.objects.all().delete()
+        call_command("import_catalog", "products", path, stdout=open(os.devnull, "w"))
+        self.assertEqual(Product.objects.get(slug="pump").category, self.category)
+        self.assertEqual(Product.objects.count(), 2)
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL-specific")
+class CatalogQueryPlanTests(QueryPlanAssertions, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Product.objects.bulk_create(
+            Product(name=f"Product {i:05d}", slug=f"product-{i}", price_cents=i, is_active=i % 10 != 0) for i in range(5000)
+        )
+        Service.objects.bulk_create(
+            Service(name=f"Service {i:05d}", slug=f"service-{i}", base_price_cents=i, is_active=i % 10 != 0) for i in range(5000)
+        )
+        cls.analyze(Product, Service)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_listings_and_details_use_indexes(self):
+        with self.assertNoSeqScan(Product):
+            r = self.client.get("/api/catalog/products/")
+            self.client.get(r.data["next"])
+            self.client.get("/api/catalog/products/product-42/")
+        with self.assertNoSeqScan(Service):
+            self.client.get("/api/catalog/services/")
+            self.client.get("/api/catalog/services/service-42/")
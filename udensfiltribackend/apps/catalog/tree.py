@@ -0,0 +1,53 @@
+from django.db.models import Count, Q
+
+from .models import Category
+
+
+def compute_paths(rows) -> dict:
+    """``{id: path}`` for ``(id, parent_id)`` rows, walking down from the roots."""
+    children = {}
+    for pk, parent_id in rows:
+        children.setdefault(parent_id, []).append(pk)
+    paths = {}
+    stack = [(pk, "") for pk in children.get(None, ())]
+    while stack:
+        pk, prefix = stack.pop()
+        paths[pk] = f"{prefix}{pk}/"
+        stack.extend((child, paths[pk]) for child in children.get(pk, ()))
+    return paths
+
+
+def rebuild_category_paths() -> int:
+    """Recompute every ``path``; for rows written without ``save()`` (bulk import, deletes)."""
+    current = {pk: (parent_id, path) for pk, parent_id, path in Category.objects.values_list("id", "parent_id", "path")}
+    paths = compute_paths((pk, parent_id) for pk, (parent_id, _) in current.items())
+    stale = [Category(id=pk, path=path) for pk, path in paths.items() if current[pk][1] != path]
+    Category.objects.bulk_update(stale, ["path"], batch_size=1000)
+    return len(stale)
+
+
+def category_tree() -> list:
+    """Nested categories with direct and subtree active product counts, from one grouped query."""
+    rows = list(
+        Category.objects.annotate(product_count=Count("products", filter=Q(products__is_active=True)))
+        .order_by("name", "id")
+        .values("id", "name", "slug", "parent_id", "path", "product_count")
+    )
+    nodes = {}
+    for row in rows:
+        nodes[row["id"]] = {
+            "id": row["id"], "name": row["name"], "slug": row["slug"],
+            "product_count": row["product_count"], "total_product_count": row["product_count"], "children": [],
+        }
+    roots = []
+    for row in rows:
+        node = nodes[row["id"]]
+        if row["parent_id"] is None:
+            roots.append(node)
+        else:
+            nodes[row["parent_id"]]["children"].append(node)
+        # Every ancestor in the path (excluding the node itself) includes this node's products.
+        for ancestor in row["path"].split("/")[:-2]:
+            if ancestor and int(ancestor) in nodes:
+                nodes[int(ancestor)]["total_product_count"] += row["product_count"]
+    return roots
@@ -1,20 +1,74 @@
 from rest_framework import viewsets, permissions
-from .models import Category, Product, Service
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from config.cache import CachedResponseMixin
+from config.fastpath import ValuesListMixin
+from config.fieldsets import SparseFieldsetViewMixin
+from .filters import CatalogFilterBackend, compute_facets
+from .models import Category, GroupPrice, Product, Service
+from .pricing import pricing_group_for, with_customer_prices
+from .tree import category_tree
 from .serializers import CategorySerializer, ProductSerializer, ServiceSerializer
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Category.objects.all().order_by("name")
+class CategoryViewSet(CachedResponseMixin, ValuesListMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Category.objects.all().order_by("name", "id")
     serializer_class = CategorySerializer
     permission_classes=[permissions.AllowAny]
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Product.objects.filter(is_active=True).order_by("name")
-    serializer_class = ProductSerializer
+    @property
+    def cache_models(self):
+        # Only the tree carries product counts; plain listings ignore product churn.
+        return (Category, Product) if self.action == "tree" else (Category,)
+
+    @action(detail=False)
+    def tree(self, request):
+        return self.cached_response(self._tree, request)
+
+    def _tree(self, request):
+        return Response(category_tree())
+
+class CatalogItemViewSet(SparseFieldsetViewMixin, CachedResponseMixin, ValuesListMixin, viewsets.ReadOnlyModelViewSet):
+    """Shared read API for products and services: filters plus a facets summary."""
     permission_classes=[permissions.AllowAny]
+    filter_backends=[CatalogFilterBackend]
     lookup_field="slug"
+    price_field = None
+
+    @property
+    def pricing(self):
+        if not hasattr(self, "_pricing"):
+            self._pricing = pricing_group_for(self.request.user)
+        return self._pricing
+
+    def get_queryset(self):
+        return with_customer_prices(super().get_queryset(), self.price_field, self.pricing)
+
+    def get_cache_variant(self, request):
+        # Staff may filter on is_active and discount groups see their own prices,
+        # so neither may share payloads with anonymous visitors.
+        variant = "staff" if request.user.is_staff else ""
+        if self.pricing:
+            variant += "g%s-%s" % self.pricing
+        return variant
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Service.objects.filter(is_active=True).order_by("name")
+    @action(detail=False)
+    def facets(self, request):
+        return self.cached_response(self._facets, request)
+
+    def _facets(self, request):
+        # Facets describe the whole matching catalog, so they ignore their own dimensions.
+        qs = CatalogFilterBackend().filter_queryset(request, self.queryset.all(), self, exclude=("category", "min_price", "max_price"))
+        return Response(compute_facets(qs, self.price_field))
+
+class ProductViewSet(CatalogItemViewSet):
+    queryset = Product.objects.order_by("name", "id")
+    serializer_class = ProductSerializer
+    price_field = "price_cents"
+    # Deleting a category nulls product.category via an UPDATE that sends no signals.
+    cache_models=(Product, Category, GroupPrice)
+
+class ServiceViewSet(CatalogItemViewSet):
+    queryset = Service.objects.order_by("name", "id")
     serializer_class = ServiceSerializer
-    permission_classes=[permissions.AllowAny]
-    lookup_field="slug"
+    price_field = "base_price_cents"
+    cache_models=(Service, GroupPrice)
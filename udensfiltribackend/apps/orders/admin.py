@@ -1,23 +1,27 @@
 from django.contrib import admin
+from django.utils import timezone
+
+from config.admin_search import IndexedSearchMixin
 
 from .models import Order
 
 
 @admin.action(description="Mark selected orders paid")
 def mark_paid(modeladmin, request, queryset):
-    queryset.update(status="paid")
+    queryset.update(status="paid", updated_at=timezone.now())
 
 
 @admin.action(description="Mark selected orders cancelled")
 def mark_cancelled(modeladmin, request, queryset):
-    queryset.update(status="cancelled")
+    queryset.update(status="cancelled", updated_at=timezone.now())
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ("id", "user", "email", "status", "total_cents", "currency", "created_at")
     list_filter = ("status", "currency", "created_at")
-    search_fields = ("id", "user__phone", "user__email", "email", "stripe_session_id", "stripe_payment_intent_id")
+    search_fields = ("=id", "user__phone", "user__email", "email", "=stripe_session_id", "=stripe_payment_intent_id")
+    exact_search_patterns = (("id", r"#(\d+)"), ("stripe_session_id", r"cs_\w+"), ("stripe_payment_intent_id", r"pi_\w+"))
     list_select_related = ("user",)
     readonly_fields = ("created_at", "updated_at", "stripe_session_id", "stripe_payment_intent_id")
     actions = [mark_paid, mark_cancelled]
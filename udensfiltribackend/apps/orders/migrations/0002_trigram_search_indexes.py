@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:42
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+from config.db_operations import CreateExtensionIfAvailable, PostgresAddIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        CreateExtensionIfAvailable("pg_trgm"),
+        PostgresAddIndex(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="orders_order_email_trgm",
+            ),
+            extension="pg_trgm",
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["stripe_session_id"], name="orders_stripe_session_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["stripe_payment_intent_id"], name="orders_stripe_intent_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,27 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+from django.db.models.fields.json import KT
 from django.conf import settings
 
+
+class JSONArrayLength(models.Func):
+    function = "JSON_ARRAY_LENGTH"
+    output_field = models.IntegerField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function="JSONB_ARRAY_LENGTH", **extra_context)
+
+
+class OrderQuerySet(models.QuerySet):
+    def summaries(self):
+        """Order rows without the ``items`` blob; count and first name come from the database."""
+        return self.defer("items").annotate(
+            item_count=JSONArrayLength("items"),
+            first_item_name=KT("items__0__name"),
+        )
+
+
 class Order(models.Model):
     STATUS=[("created","created"),("paid","paid"),("cancelled","cancelled")]
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="orders")
@@ -13,4 +34,13 @@ class Order(models.Model):
     stripe_payment_intent_id = models.CharField(max_length=255, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    objects = OrderQuerySet.as_manager()
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="orders_order_email_trgm"),
+            models.Index(fields=["stripe_session_id"], name="orders_stripe_session_idx"),
+            models.Index(fields=["stripe_payment_intent_id"], name="orders_stripe_intent_idx"),
+            models.Index(fields=["user", "-created_at"], name="orders_order_user_created"),
+            models.Index(fields=["-created_at"], name="orders_order_created_idx"),
+        ]
     def __str__(self): return f"Order #{self.id} ({self.status})"
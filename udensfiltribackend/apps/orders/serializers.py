@@ -1,7 +1,8 @@
+from django.db.models import Q
 from rest_framework import serializers
 
-from apps.accounts.models import GroupDiscount
-from apps.catalog.models import Product, Service
+from apps.catalog.models import GroupPrice, Product, Service
+from apps.catalog.pricing import discounted_price, pricing_group_for
 from .models import Order
 
 
@@ -11,29 +12,42 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ("id", "status", "currency", "total_cents", "items", "created_at", "updated_at")
 
 
+class OrderSummarySerializer(serializers.ModelSerializer):
+    item_count = serializers.IntegerField(read_only=True)
+    first_item_name = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Order
+        fields = ("id", "status", "currency", "total_cents", "item_count", "first_item_name", "created_at", "updated_at")
+
+
 class CreateCheckoutSerializer(serializers.Serializer):
     items = serializers.ListField(child=serializers.DictField(), allow_empty=False)
     currency = serializers.CharField(required=False)
     email = serializers.EmailField(required=False, allow_blank=True, allow_null=True)
 
-    def _resolve_discount(self):
+    def _resolve_pricing(self):
         req = self.context.get("request")
-        user = getattr(req, "user", None)
-        if not user or not user.is_authenticated:
-            return 0
-        result = (
-            GroupDiscount.objects.filter(group__user=user, is_active=True)
-            .order_by("-percentage")
-            .values_list("percentage", flat=True)
-            .first()
+        return pricing_group_for(getattr(req, "user", None))
+
+    def _group_prices(self, pricing, product_ids, service_ids):
+        """Precomputed (price_cents, discount_percent) per ("product"|"service", id) for the user's group."""
+        if pricing is None:
+            return {}
+        rows = GroupPrice.objects.filter(group_id=pricing[0]).filter(
+            Q(product_id__in=product_ids) | Q(service_id__in=service_ids)
         )
-        return int(result or 0)
+        return {
+            ("product", row.product_id) if row.product_id else ("service", row.service_id): (row.price_cents, row.discount_percent)
+            for row in rows
+        }
 
     def validate_items(self, items):
         normalized_items = []
         total = 0
         currency = None
-        discount_pct = self._resolve_discount()
+        pricing = self._resolve_pricing()
+        group_pct = pricing[1] if pricing else 0
 
         product_ids = [int(it["product_id"]) for it in items if it.get("product_id")]
         service_ids = [int(it["service_id"]) for it in items if it.get("service_id")]
@@ -42,6 +56,7 @@ class CreateCheckoutSerializer(serializers.Serializer):
         services = Service.objects.filter(id__in=service_ids, is_active=True)
         product_map = {obj.id: obj for obj in products}
         service_map = {obj.id: obj for obj in services}
+        group_prices = self._group_prices(pricing, product_ids, service_ids)
 
         for raw in items:
             qty = int(raw.get("qty", 1))
@@ -72,9 +87,10 @@ class CreateCheckoutSerializer(serializers.Serializer):
                 item_type = "service"
                 item_ref = {"service_id": obj.id}
 
-            discounted_unit_price_cents = base_unit_price_cents
-            if discount_pct > 0:
-                discounted_unit_price_cents = (base_unit_price_cents * (100 - discount_pct)) // 100
+            # Missing rows (table not rebuilt yet) fall back to the same formula.
+            discounted_unit_price_cents, discount_pct = group_prices.get(
+                (item_type, obj.id), (discounted_price(base_unit_price_cents, group_pct), group_pct)
+            )
 
             normalized_items.append(
                 {
@@ -1,11 +1,28 @@
+import datetime
+from decimal import Decimal
+from io import BytesIO
+
+from django.contrib.admin.sites import AdminSite
 from django.contrib.auth.models import Group
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
+from unittest import skipUnless
 from unittest.mock import patch
 
 from apps.accounts.models import BUSINESS_USERS_GROUP, GroupDiscount, User
-from apps.catalog.models import Product
+from apps.catalog.models import GroupPrice, Product
+from apps.orders.admin import OrderAdmin
 from apps.orders.models import Order
+from apps.orders.serializers import OrderSerializer, OrderSummarySerializer
+from config.parsers import ORJSONParser
+from config.query_plans import QueryPlanAssertions
+from config.renderers import ORJSONRenderer
 
 
 class StripeFlowTests(TestCase):
@@ -42,6 +59,19 @@ class StripeFlowTests(TestCase):
         self.assertEqual(order.items[0]["discount_percent"], 15)
         self.assertEqual(order.items[0]["unit_price_cents"], 1700)
 
+    @patch("apps.orders.views.stripe.checkout.Session.create")
+    def test_checkout_reads_precomputed_group_price(self, mock_create):
+        mock_create.return_value = {"id": "cs_test_4", "url": "https://stripe.test/checkout"}
+        group = Group.objects.get(name=BUSINESS_USERS_GROUP)
+        self.user.groups.add(group)
+        product = Product.objects.create(name="Softener", slug="softener", price_cents=5000, currency="EUR", is_active=True)
+        GroupPrice.objects.filter(group=group, product=product).update(price_cents=4321)
+
+        payload = {"items": [{"product_id": product.id, "qty": 1}], "currency": "EUR"}
+        r = self.client.post("/api/orders/payments/create-checkout-session/", payload, format="json")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(Order.objects.get(id=r.data["orderId"]).total_cents, 4321)
+
     @patch("apps.orders.views.stripe.Webhook.construct_event")
     def test_webhook_marks_paid_idempotent(self, mock_event):
         order = Order.objects.create(
@@ -70,3 +100,152 @@ class StripeFlowTests(TestCase):
         r = self.client.post("/api/orders/payments/create-checkout-session/", payload, format="json")
         self.assertEqual(r.status_code, 400)
         mock_create.assert_not_called()
+
+
+class OrderConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(phone="+37122000001", password="StrongPass123")
+        r = self.client.post("/api/auth/login/", {"phone": self.user.phone, "password": "StrongPass123"}, format="json")
+        self.client.cookies = r.cookies
+        self.order = Order.objects.create(user=self.user, total_cents=1000, items=[{"name": "x", "qty": 1}])
+
+    def test_matching_etag_returns_304_without_loading_order(self):
+        r = self.client.get(f"/api/orders/{self.order.id}/")
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("ETag", r)
+        self.assertIn("Last-Modified", r)
+        with self.assertNumQueries(2):  # user lookup + updated_at probe
+            r2 = self.client.get(f"/api/orders/{self.order.id}/", HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r2.status_code, 304)
+        self.assertEqual(r2.content, b"")
+
+    def test_status_change_invalidates_etag(self):
+        r = self.client.get(f"/api/orders/{self.order.id}/")
+        self.order.status = "paid"
+        self.order.save(update_fields=["status", "updated_at"])
+        r2 = self.client.get(f"/api/orders/{self.order.id}/", HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r2.status_code, 200)
+        self.assertEqual(r2.data["status"], "paid")
+
+
+class OrderListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(phone="+37122000002", password="StrongPass123")
+        r = self.client.post("/api/auth/login/", {"phone": self.user.phone, "password": "StrongPass123"}, format="json")
+        self.client.cookies = r.cookies
+        self.orders = [Order.objects.create(user=self.user, total_cents=100 * i) for i in range(1, 4)]
+
+    def test_cursor_walks_newest_first_without_count(self):
+        seen = []
+        url = "/api/orders/?page_size=2"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+            seen += [o["id"] for o in r.data["results"]]
+            url = r.data["next"]
+        self.assertEqual(seen, [o.id for o in reversed(self.orders)])
+
+    def test_list_returns_summaries_without_items(self):
+        Order.objects.filter(id=self.orders[-1].id).update(items=[{"name": "Pump", "qty": 1}, {"name": "Filter", "qty": 2}])
+        self.assertIn("items", Order.objects.summaries().first().get_deferred_fields())
+        r = self.client.get("/api/orders/")
+        first = r.data["results"][0]
+        self.assertNotIn("items", first)
+        self.assertEqual(first["item_count"], 2)
+        self.assertEqual(first["first_item_name"], "Pump")
+        self.assertEqual(r.data["results"][-1]["item_count"], 0)
+        self.assertIsNone(r.data["results"][-1]["first_item_name"])
+
+    def test_list_matches_summary_serializer(self):
+        Order.objects.filter(id=self.orders[0].id).update(items=[{"name": "Pump", "qty": 1}])
+        expected = OrderSummarySerializer(Order.objects.summaries().order_by("-created_at"), many=True).data
+        self.assertEqual(self.client.get("/api/orders/").data["results"], expected)
+
+
+class OrderAdminSearchTests(TestCase):
+    def setUp(self):
+        self.admin = OrderAdmin(Order, AdminSite())
+        self.user = User.objects.create_user(phone="+37122000003", password="StrongPass123", email="buyer@example.com")
+        self.other = User.objects.create_user(phone="+37129999999", password="StrongPass123")
+        self.order = Order.objects.create(user=self.user, stripe_session_id="cs_live_abc", stripe_payment_intent_id="pi_123")
+        self.other_order = Order.objects.create(user=self.other, email="gift@example.com")
+
+    def search(self, term):
+        qs, may_have_duplicates = self.admin.get_search_results(None, Order.objects.all(), term)
+        self.assertFalse(may_have_duplicates)
+        return qs
+
+    def test_exact_fast_paths(self):
+        self.assertEqual(list(self.search(f"#{self.order.id}")), [self.order])
+        self.assertEqual(list(self.search("cs_live_abc")), [self.order])
+        self.assertEqual(list(self.search("pi_123")), [self.order])
+        self.assertEqual(list(self.search("cs_live_ab")), [])
+
+    def test_related_fields_are_searched_through_subqueries(self):
+        qs = self.search("BUYER@")
+        self.assertIn("IN (SELECT", str(qs.query))
+        self.assertEqual(list(qs), [self.order])
+        self.assertEqual(list(self.search("2999")), [self.other_order])
+        self.assertEqual(list(self.search("gift")), [self.other_order])
+
+    def test_non_numeric_term_skips_id_equality(self):
+        self.assertCountEqual(self.search("example"), [self.order, self.other_order])
+
+    @skipUnless(connection.vendor == "postgresql", "trigram indexes require PostgreSQL")
+    def test_email_search_uses_trigram_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            if not cursor.fetchone():
+                self.skipTest("pg_trgm is not installed")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = Order.objects.filter(email__icontains="gift").explain()
+        self.assertIn("orders_order_email_trgm", plan)
+
+
+class JSONCodecTests(TestCase):
+    def test_renderer_output_matches_stock_renderer(self):
+        now = datetime.datetime(2026, 1, 1, 10, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+        order = Order(id=1, items=[{"name": "Ūdens filtrs\u2028", "qty": 1}], total_cents=100, created_at=now, updated_at=now)
+        payload = {
+            "order": OrderSerializer(order).data,
+            "at": now,
+            "day": datetime.date(2026, 1, 1),
+            "amount": Decimal("1.50"),
+            "label": gettext_lazy("Orders"),
+            "errors": {"items": [ErrorDetail("This field is required.", code="required")]},
+        }
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_renderer_falls_back_for_values_orjson_cannot_encode(self):
+        payload = {"serial": 2 ** 70, "amount": Decimal("1.50")}
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_parser_matches_stock_parser_and_rejects_nan(self):
+        body = '{"items": [{"name": "Sūknis", "qty": 2}], "total": 1.5}'.encode()
+        self.assertEqual(ORJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"total": NaN}'))
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL-specific")
+class OrderQueryPlanTests(QueryPlanAssertions, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(User(phone=f"+3712300{i:04d}") for i in range(50))
+        cls.user = users[0]
+        cls.admin = User.objects.create_superuser(phone="+37123999999", password="StrongPass123")
+        Order.objects.bulk_create(Order(user=users[i % 50], total_cents=i) for i in range(5000))
+        cls.analyze(Order)
+
+    def test_history_uses_indexes(self):
+        client = APIClient()
+        for user in (self.user, self.admin):
+            client.force_authenticate(user)
+            with self.assertNoSeqScan(Order):
+                r = client.get("/api/orders/")
+                client.get(r.data["next"])
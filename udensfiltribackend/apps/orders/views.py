@@ -7,10 +7,14 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from config.conditional import make_etag, not_modified, set_validators
+from config.fastpath import serialize_values, values_plan, values_queryset
+from config.pagination import KeysetPagination
+
 logger = logging.getLogger(__name__)
 
 from .models import Order
-from .serializers import CreateCheckoutSerializer, OrderSerializer
+from .serializers import CreateCheckoutSerializer, OrderSerializer, OrderSummarySerializer
 from .emailing import send_order_paid_email
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -18,17 +22,30 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_orders(request):
-    qs = Order.objects.all().order_by("-created_at") if request.user.is_superuser else Order.objects.filter(user=request.user).order_by("-created_at")
-    return Response(OrderSerializer(qs, many=True).data)
+    qs = Order.objects.summaries()
+    qs = qs.order_by("-created_at") if request.user.is_superuser else qs.filter(user=request.user).order_by("-created_at")
+    plan = values_plan(OrderSummarySerializer())
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(values_queryset(qs, plan), request)
+    return paginator.get_paginated_response(serialize_values(page, plan))
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_order(request, order_id: int):
+    qs = Order.objects.filter(id=order_id) if request.user.is_superuser else Order.objects.filter(id=order_id, user=request.user)
+    updated_at = qs.values_list("updated_at", flat=True).first()
+    if updated_at is None:
+        return Response({"detail":"Not found"}, status=404)
+    etag = make_etag("order", order_id, updated_at.isoformat())
+    resp = not_modified(request, etag=etag, last_modified=updated_at)
+    if resp is not None:
+        return resp
     try:
-        order = Order.objects.get(id=order_id) if request.user.is_superuser else Order.objects.get(id=order_id, user=request.user)
+        order = qs.get()
     except Order.DoesNotExist:
         return Response({"detail":"Not found"}, status=404)
-    return Response(OrderSerializer(order).data)
+    etag = make_etag("order", order_id, order.updated_at.isoformat())
+    return set_validators(Response(OrderSerializer(order).data), etag, order.updated_at)
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -62,7 +79,7 @@ def create_checkout_session(request):
         metadata={"order_id": str(order.id)},
     )
     order.stripe_session_id = session.get("id","")
-    order.save(update_fields=["stripe_session_id"])
+    order.save(update_fields=["stripe_session_id", "updated_at"])
     return Response({"orderId": order.id, "checkoutUrl": session.get("url")})
 
 @csrf_exempt
@@ -92,7 +109,7 @@ def webhook(request):
                     order.status = "paid"
                     order.stripe_session_id = session_id or order.stripe_session_id
                     order.stripe_payment_intent_id = payment_intent or order.stripe_payment_intent_id
-                    order.save(update_fields=["status","stripe_session_id","stripe_payment_intent_id"])
+                    order.save(update_fields=["status","stripe_session_id","stripe_payment_intent_id","updated_at"])
                     send_order_paid_email(order)
             except Order.DoesNotExist:
                 pass
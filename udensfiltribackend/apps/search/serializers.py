@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+SEARCH_TYPES = ("product", "service", "post")
+
+
+class SearchParamsSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    type = serializers.CharField(required=False, allow_blank=True)
+    lang = serializers.ChoiceField(choices=list(settings.SEARCH_CONFIGS), required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+
+    def validate_type(self, value):
+        types = [t.strip() for t in (value or "").split(",") if t.strip()]
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown type(s): {', '.join(sorted(unknown))}")
+        return types or list(SEARCH_TYPES)
+
+    def validate(self, attrs):
+        attrs.setdefault("type", list(SEARCH_TYPES))
+        return attrs
@@ -0,0 +1,46 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.blog.models import Post
+from apps.catalog.models import Product, Service
+
+
+@skipUnless(connection.vendor == "postgresql", "full-text search requires PostgreSQL")
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Product.objects.create(name="Reverse osmosis filter", slug="ro-filter", description="Removes hardness and chlorine")
+        Product.objects.create(name="Shower head", slug="shower-head", description="Chrome, with a small filter cartridge")
+        Product.objects.create(name="Old filter", slug="old-filter", is_active=False)
+        Service.objects.create(name="Filter installation", slug="filter-install")
+        Post.objects.create(title="Choosing a water filter", slug="choosing", body="...", status="published")
+        Post.objects.create(title="Draft about filters", slug="draft", body="...")
+
+    def test_ranks_title_matches_above_description_matches(self):
+        r = self.client.get("/api/search/", {"q": "filter", "type": "product"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([row["slug"] for row in r.data["results"]], ["ro-filter", "shower-head"])
+
+    def test_searches_all_types_and_skips_unpublished(self):
+        r = self.client.get("/api/search/", {"q": "filters"})
+        found = {(row["type"], row["slug"]) for row in r.data["results"]}
+        self.assertEqual(found, {("product", "ro-filter"), ("product", "shower-head"), ("service", "filter-install"), ("post", "choosing")})
+
+    def test_vector_follows_edits(self):
+        product = Product.objects.get(slug="shower-head")
+        product.description = "Chrome"
+        product.save()
+        r = self.client.get("/api/search/", {"q": "filter", "type": "product"})
+        self.assertEqual([row["slug"] for row in r.data["results"]], ["ro-filter"])
+
+    def test_latvian_configuration_matches_exact_words(self):
+        Product.objects.create(name="Ūdens mīkstinātājs", slug="softener", description="Cietības filtrs")
+        r = self.client.get("/api/search/", {"q": "filtrs", "lang": "lv"})
+        self.assertEqual([row["slug"] for row in r.data["results"]], ["softener"])
+
+    def test_rejects_unknown_type(self):
+        r = self.client.get("/api/search/", {"q": "filter", "type": "order"})
+        self.assertEqual(r.status_code, 400)
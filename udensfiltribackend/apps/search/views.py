@@ -0,0 +1,45 @@
+from django.contrib.postgres.search import SearchRank
+from django.db import connection
+from django.db.models import F
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from apps.blog.models import Post
+from apps.catalog.models import Product, Service
+from config.search import build_search_query
+from .serializers import SearchParamsSerializer
+
+
+def _sources():
+    return {
+        "product": (Product.objects.filter(is_active=True), ("id", "slug", "name", "price_cents", "currency", "image_url")),
+        "service": (Service.objects.filter(is_active=True), ("id", "slug", "name", "base_price_cents", "currency")),
+        "post": (Post.objects.filter(status="published"), ("id", "slug", "title", "excerpt", "cover_image_url", "published_at")),
+    }
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def search(request):
+    ser = SearchParamsSerializer(data=request.query_params)
+    ser.is_valid(raise_exception=True)
+    params = ser.validated_data
+    if connection.vendor != "postgresql":
+        return Response({"detail": "Search requires PostgreSQL"}, status=503)
+
+    query = build_search_query(params["q"], params.get("lang"))
+    limit = params["limit"]
+    sources = _sources()
+    results = []
+    for search_type in params["type"]:
+        qs, fields = sources[search_type]
+        rows = (
+            qs.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "id")
+            .values(*fields, "rank")[:limit]
+        )
+        results.extend({"type": search_type, **row} for row in rows)
+    results.sort(key=lambda row: row["rank"], reverse=True)
+    return Response({"query": params["q"], "results": results[:limit]})
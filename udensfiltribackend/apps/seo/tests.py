@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.blog.models import Post
+from apps.catalog.models import Product, Service
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Post.objects.create(title="Hard water", slug="hard-water", excerpt="Short", status="published")
+        Post.objects.create(title="Draft", slug="draft")
+        for i in range(3):
+            Product.objects.create(name=f"Filter {i}", slug=f"filter-{i}")
+        Product.objects.create(name="Hidden", slug="hidden", is_active=False)
+        Service.objects.create(name="Install", slug="install")
+
+    def body(self, response):
+        if not response.streaming:
+            return response.content
+
+        async def consume():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        return async_to_sync(consume)()
+
+    def test_index_splits_sections_by_limit(self):
+        with patch("apps.seo.views.SITEMAP_LIMIT", 2):
+            body = self.body(self.client.get("/sitemap.xml")).decode()
+            self.assertIn("/sitemap-products-2.xml", body)
+            self.assertNotIn("/sitemap-products-3.xml", body)
+            page2 = self.body(self.client.get("/sitemap-products-2.xml")).decode()
+            self.assertEqual(page2.count("<url>"), 1)
+            self.assertEqual(self.client.get("/sitemap-products-3.xml").status_code, 404)
+
+    def test_section_streams_then_serves_from_cache_until_change(self):
+        first = self.client.get("/sitemap-posts-1.xml")
+        self.assertTrue(first.streaming)
+        self.assertTrue(first.is_async)
+        body = self.body(first).decode()
+        self.assertIn("<loc>http://localhost:3000/blog/hard-water</loc><lastmod>", body)
+        self.assertNotIn("draft", body)
+        with self.assertNumQueries(0):
+            second = self.client.get("/sitemap-posts-1.xml")
+        self.assertEqual(second.content.decode(), body)
+        self.assertEqual(self.client.get("/sitemap-posts-1.xml", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.get(slug="draft").publish()
+        self.assertIn("/blog/draft<", self.body(self.client.get("/sitemap-posts-1.xml")).decode())
+
+    def test_cached_section_page_skips_existence_check(self):
+        with patch("apps.seo.views.SITEMAP_LIMIT", 2):
+            body = self.body(self.client.get("/sitemap-products-2.xml"))
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get("/sitemap-products-2.xml").content, body)
+
+    def test_query_strings_share_one_entry(self):
+        body = self.body(self.client.get("/feeds/blog.rss"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/feeds/blog.rss", {"x": 1}).content, body)
+
+    def test_feeds(self):
+        rss = self.client.get("/feeds/blog.rss")
+        self.assertEqual(rss["Content-Type"], "application/rss+xml; charset=utf-8")
+        self.assertIn("<link>http://localhost:3000/blog/hard-water</link>", self.body(rss).decode())
+        atom = self.body(self.client.get("/feeds/blog.atom")).decode()
+        self.assertIn('<link href="http://localhost:3000/blog/hard-water" rel="alternate"', atom)
+        self.assertNotIn("draft", atom)
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("sitemap.xml", views.sitemap_index),
+    path("sitemap-<slug:section>-<int:page>.xml", views.sitemap_section, name="sitemap-section"),
+    path("feeds/blog.rss", views.rss_feed),
+    path("feeds/blog.atom", views.atom_feed),
+]
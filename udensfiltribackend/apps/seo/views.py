@@ -0,0 +1,153 @@
+"""Crawler endpoints: sitemap index, sitemap pages and blog RSS/Atom feeds.
+
+Bodies are generated from ``values_list().iterator()`` and streamed on the
+first request; the finished bytes are cached under the source models'
+generations, so later requests (and 304 revalidations) never touch the database
+until the content changes. The stream is an async iterator, because ASGI
+servers buffer a synchronous one in full before sending it.
+"""
+import hashlib
+import math
+from xml.sax.saxutils import escape
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import feedgenerator
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+
+from apps.blog.models import Post
+from apps.catalog.models import Product, Service
+from config.cache import RESPONSE_KEY, get_generations
+from config.conditional import make_etag
+
+
+SITEMAP_LIMIT = 50000  # URLs per sitemap file, per the sitemaps.org protocol
+SITEMAP_CHUNK = 1000
+SITEMAP_SECTIONS = {
+    "posts": (Post, lambda: Post.objects.filter(status="published"), "updated_at"),
+    "products": (Product, lambda: Product.objects.filter(is_active=True), None),
+    "services": (Service, lambda: Service.objects.filter(is_active=True), None),
+}
+XML = "application/xml; charset=utf-8"
+
+
+def _frontend_url(kind, slug):
+    return settings.FRONTEND_BASE_URL.rstrip("/") + settings.FRONTEND_PATHS[kind].format(slug=slug)
+
+
+async def _store(key, chunks):
+    # Each chunk is pulled on the request's sync thread, which owns the
+    # database connection (and server-side cursor) the generator reads from.
+    pull = sync_to_async(next)
+    parts = []
+    while (chunk := await pull(chunks, None)) is not None:
+        parts.append(chunk)
+        yield chunk
+    await cache.aset(key, "".join(parts), settings.API_CACHE_TIMEOUT)
+
+
+def _cached_stream(request, name, models, content_type, generate, exists=None):
+    """Serve ``generate()`` from the cache, streaming and caching it on a miss.
+
+    ``exists`` is only called on a miss; returning False gives a 404.
+    """
+    generations = ".".join(str(g) for g in get_generations(*models))
+    # These views take no query parameters, so the query string is left out of
+    # the key: ?x=1, ?x=2, ... must not each store a copy of the body.
+    key = RESPONSE_KEY % (name, generations, hashlib.md5(request.build_absolute_uri(request.path).encode()).hexdigest())
+    etag = make_etag(key)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        body = cache.get(key)
+        if body is not None:
+            response = HttpResponse(body, content_type=content_type)
+        elif exists is not None and not exists():
+            raise Http404
+        else:
+            response = StreamingHttpResponse(_store(key, iter(generate())), content_type=content_type)
+    response["ETag"] = etag
+    return response
+
+
+def _urlset(kind, queryset, lastmod_field):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    fields = ("slug", lastmod_field) if lastmod_field else ("slug",)
+    lines = []
+    for row in queryset.values_list(*fields).iterator(chunk_size=SITEMAP_CHUNK):
+        lastmod = f"<lastmod>{row[1].date().isoformat()}</lastmod>" if lastmod_field and row[1] else ""
+        lines.append(f"<url><loc>{escape(_frontend_url(kind, row[0]))}</loc>{lastmod}</url>\n")
+        if len(lines) >= SITEMAP_CHUNK:
+            yield "".join(lines)
+            lines = []
+    lines.append("</urlset>\n")
+    yield "".join(lines)
+
+
+@require_GET
+def sitemap_index(request):
+    models = [model for model, _, _ in SITEMAP_SECTIONS.values()]
+
+    def generate():
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        for section, (_, queryset, _) in SITEMAP_SECTIONS.items():
+            pages = max(1, math.ceil(queryset().count() / SITEMAP_LIMIT))
+            for page in range(1, pages + 1):
+                loc = request.build_absolute_uri(reverse("sitemap-section", args=[section, page]))
+                yield f"<sitemap><loc>{escape(loc)}</loc></sitemap>\n"
+        yield "</sitemapindex>\n"
+
+    return _cached_stream(request, "sitemap.index", models, XML, generate)
+
+
+@require_GET
+def sitemap_section(request, section, page):
+    if section not in SITEMAP_SECTIONS or page < 1:
+        raise Http404
+    model, queryset, lastmod_field = SITEMAP_SECTIONS[section]
+    start = (page - 1) * SITEMAP_LIMIT
+    rows = queryset().order_by("id")[start:start + SITEMAP_LIMIT]
+    kind = section.rstrip("s")
+    return _cached_stream(
+        request, f"sitemap.{section}", [model], XML, lambda: _urlset(kind, rows, lastmod_field),
+        # Page 1 always exists, if only as an empty urlset.
+        exists=rows.exists if page > 1 else None,
+    )
+
+
+def _feed(request, feed_class, content_type):
+    def generate():
+        feed = feed_class(
+            title=settings.BLOG_FEED_TITLE,
+            link=settings.FRONTEND_BASE_URL.rstrip("/") + settings.FRONTEND_PATHS["blog"],
+            description=settings.BLOG_FEED_TITLE,
+            language=settings.LANGUAGE_CODE,
+            feed_url=request.build_absolute_uri(request.path),
+        )
+        rows = (
+            Post.objects.filter(status="published")
+            .order_by("-published_at", "-id")
+            .values_list("title", "slug", "excerpt", "published_at", "updated_at")[:settings.BLOG_FEED_ITEMS]
+        )
+        for title, slug, excerpt, published_at, updated_at in rows.iterator():
+            link = _frontend_url("post", slug)
+            feed.add_item(
+                title=title, link=link, description=excerpt, unique_id=link,
+                pubdate=published_at, updateddate=updated_at,
+            )
+        yield feed.writeString("utf-8")
+
+    return _cached_stream(request, f"feed.{feed_class.__name__}", [Post], content_type, generate)
+
+
+@require_GET
+def rss_feed(request):
+    return _feed(request, feedgenerator.Rss201rev2Feed, "application/rss+xml; charset=utf-8")
+
+
+@require_GET
+def atom_feed(request):
+    return _feed(request, feedgenerator.Atom1Feed, "application/atom+xml; charset=utf-8")
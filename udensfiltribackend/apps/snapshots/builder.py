@@ -0,0 +1,118 @@
+"""Versioned, pre-compressed JSON snapshots of the anonymous catalog and blog index.
+
+Each build writes ``<SNAPSHOT_ROOT>/<version>/<name>.json`` plus ``.json.gz`` and
+``.json.br`` siblings (the layout nginx ``gzip_static``/``brotli_static`` expect)
+and then swaps ``current.json`` to point at it. The version is a digest of the
+payloads, so rebuilding unchanged content is a no-op and a CDN may cache every
+versioned file forever.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import brotli
+import orjson
+from django.conf import settings
+from django.utils import timezone
+
+from apps.blog.models import Post
+from apps.blog.serializers import PostListSerializer
+from apps.catalog.models import Category, Product, Service
+from apps.catalog.pricing import with_customer_prices
+from apps.catalog.serializers import CategorySerializer, ProductSerializer, ServiceSerializer
+from config.cache import get_generations
+from config.fastpath import serialize_values, values_plan, values_queryset
+from config.renderers import ORJSONRenderer
+
+
+MANIFEST = "current.json"
+SNAPSHOT_MODELS = (Category, Product, Service, Post)
+
+
+def _rows(serializer, queryset):
+    plan = values_plan(serializer)
+    return serialize_values(values_queryset(queryset, plan), plan)
+
+
+def snapshot_payloads() -> dict:
+    """What an anonymous visitor gets from the list endpoints, unpaginated."""
+    return {
+        "categories": _rows(CategorySerializer(), Category.objects.order_by("name")),
+        "products": _rows(ProductSerializer(), with_customer_prices(Product.objects.filter(is_active=True).order_by("name"), "price_cents", None)),
+        "services": _rows(ServiceSerializer(), with_customer_prices(Service.objects.filter(is_active=True).order_by("name"), "base_price_cents", None)),
+        "posts": _rows(PostListSerializer(), Post.objects.filter(status="published").order_by("-published_at", "-id")),
+    }
+
+
+def read_manifest():
+    try:
+        with open(os.path.join(settings.SNAPSHOT_ROOT, MANIFEST), "rb") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def _prune(root, keep):
+    versions = sorted(
+        (entry for entry in os.scandir(root) if entry.is_dir() and not entry.name.startswith(".")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in versions[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def build_snapshot(force=False) -> tuple:
+    """Write a snapshot if the content changed; return ``(manifest, built)``."""
+    root = settings.SNAPSHOT_ROOT
+    os.makedirs(root, exist_ok=True)
+    # Read generations before the rows: a change racing the build moves them
+    # past what we record, so the next --watch pass rebuilds.
+    generations = list(get_generations(*SNAPSHOT_MODELS))
+    renderer = ORJSONRenderer()
+    bodies = {name: renderer.render(rows) for name, rows in snapshot_payloads().items()}
+    digest = hashlib.sha256()
+    for name, body in sorted(bodies.items()):
+        digest.update(name.encode() + b"\0" + body)
+    version = digest.hexdigest()[:16]
+
+    current = read_manifest()
+    if current and current["version"] == version and not force:
+        if current.get("generations") != generations:
+            current["generations"] = generations
+            _write_atomic(os.path.join(root, MANIFEST), orjson.dumps(current))
+        return current, False
+
+    directory = os.path.join(root, version)
+    os.makedirs(directory, exist_ok=True)
+    for name, body in bodies.items():
+        path = os.path.join(directory, f"{name}.json")
+        _write_atomic(path, body)
+        _write_atomic(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        _write_atomic(path + ".br", brotli.compress(body, quality=11))
+    base = settings.SNAPSHOT_URL.rstrip("/")
+    manifest = {
+        "version": version,
+        "generated_at": timezone.now().isoformat(),
+        "generations": generations,
+        "files": {name: f"{base}/{version}/{name}.json" for name in bodies},
+    }
+    _write_atomic(os.path.join(root, MANIFEST), orjson.dumps(manifest))
+    _prune(root, settings.SNAPSHOT_KEEP)
+    return manifest, True
+
+
+def is_stale(manifest=None) -> bool:
+    manifest = manifest or read_manifest()
+    return manifest is None or manifest.get("generations") != list(get_generations(*SNAPSHOT_MODELS))
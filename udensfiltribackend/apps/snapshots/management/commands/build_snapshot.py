@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.snapshots.builder import build_snapshot, is_stale
+
+
+class Command(BaseCommand):
+    help = "Write pre-compressed JSON snapshots of the catalog and blog index for static delivery."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Rewrite even if the content is unchanged")
+        parser.add_argument(
+            "--watch", type=float, metavar="SECONDS",
+            help="Keep running and rebuild whenever catalog or blog generations move (needs a shared cache)",
+        )
+
+    def handle(self, *args, force=False, watch=None, **options):
+        self.build(force)
+        while watch:
+            time.sleep(watch)
+            if is_stale():
+                self.build(False)
+
+    def build(self, force):
+        manifest, built = build_snapshot(force=force)
+        state = "Built" if built else "Unchanged"
+        self.stdout.write(self.style.SUCCESS(f"{state} snapshot {manifest['version']}"))
@@ -0,0 +1,64 @@
+import gzip
+import json
+import os
+import tempfile
+
+import brotli
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.blog.models import Post
+from apps.catalog.models import Product
+from .builder import build_snapshot, is_stale
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        override = override_settings(SNAPSHOT_ROOT=self.root, SNAPSHOT_KEEP=2)
+        override.enable()
+        self.addCleanup(override.disable)
+        Product.objects.create(name="Filter", slug="filter", price_cents=1000)
+        Product.objects.create(name="Hidden", slug="hidden", is_active=False)
+        Post.objects.create(title="Hard water", slug="hard-water", body="Long body", status="published")
+
+    def read(self, manifest, name, suffix=""):
+        path = os.path.join(self.root, manifest["version"], f"{name}.json{suffix}")
+        with open(path, "rb") as fh:
+            return fh.read()
+
+    def test_build_writes_identical_compressed_variants(self):
+        manifest, built = build_snapshot()
+        self.assertTrue(built)
+        body = self.read(manifest, "products")
+        self.assertEqual(gzip.decompress(self.read(manifest, "products", ".gz")), body)
+        self.assertEqual(brotli.decompress(self.read(manifest, "products", ".br")), body)
+        self.assertEqual([p["slug"] for p in json.loads(body)], ["filter"])
+        post = json.loads(self.read(manifest, "posts"))[0]
+        self.assertEqual(post["slug"], "hard-water")
+        self.assertNotIn("body", post)
+
+    def test_unchanged_content_keeps_version_and_changes_produce_new_one(self):
+        first, _ = build_snapshot()
+        self.assertEqual(build_snapshot(), (first, False))
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.filter(slug="filter").update(price_cents=1200)
+            Product.objects.get(slug="filter").save()
+        self.assertTrue(is_stale())
+        second, built = build_snapshot()
+        self.assertTrue(built)
+        self.assertNotEqual(second["version"], first["version"])
+        self.assertFalse(is_stale())
+
+    def test_version_endpoint_supports_conditional_get(self):
+        client = APIClient()
+        self.assertEqual(client.get("/api/snapshot/").status_code, 404)
+        manifest, _ = build_snapshot()
+        r = client.get("/api/snapshot/")
+        self.assertEqual(r.data["version"], manifest["version"])
+        self.assertEqual(r.data["files"]["products"], f"/snapshots/{manifest['version']}/products.json")
+        self.assertEqual(client.get("/api/snapshot/", HTTP_IF_NONE_MATCH=r["ETag"]).status_code, 304)
@@ -0,0 +1,20 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from config.conditional import make_etag, not_modified, set_validators
+from .builder import read_manifest
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def snapshot_version(request):
+    manifest = read_manifest()
+    if manifest is None:
+        return Response({"detail": "No snapshot has been built"}, status=404)
+    etag = make_etag("snapshot", manifest["version"])
+    resp = not_modified(request, etag=etag)
+    if resp is not None:
+        return resp
+    data = {"version": manifest["version"], "generated_at": manifest["generated_at"], "files": manifest["files"]}
+    return set_validators(Response(data), etag)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Compare DRF's stock JSON renderer/parser with the orjson-backed ones.
+
+Payloads are built with the real serializers from unsaved model instances, so
+no database is needed:
+
+    python benchmarks/json_renderers.py [--rows 200] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import timedelta
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.accounts.models import User  # noqa: E402
+from apps.cases.models import CaseAttachment, CaseMessage, PlumbingCase  # noqa: E402
+from apps.cases.serializers import CaseMessageSerializer, PlumbingCaseSerializer  # noqa: E402
+from apps.catalog.models import Product  # noqa: E402
+from apps.catalog.serializers import ProductSerializer  # noqa: E402
+from apps.orders.models import Order  # noqa: E402
+from apps.orders.serializers import OrderSerializer  # noqa: E402
+from config.parsers import ORJSONParser  # noqa: E402
+from config.renderers import ORJSONRenderer  # noqa: E402
+
+
+def product_list(rows):
+    products = [
+        Product(
+            id=i, name=f"Ūdens filtrs {i}", slug=f"filter-{i}", description="Reverse osmosis cartridge, 5 µm. " * 8,
+            price_cents=1000 + i, currency="EUR", image_url=f"https://cdn.example.lv/p/{i}.webp", category_id=i % 7 or None,
+        )
+        for i in range(rows)
+    ]
+    for p in products:
+        p.customer_price_cents, p.discount_percent = p.price_cents * 9 // 10, 10
+    return {"next": None, "previous": None, "results": ProductSerializer(products, many=True).data}
+
+
+def order_history(rows):
+    now = timezone.now()
+    orders = [
+        Order(
+            id=i, status="paid", currency="EUR", total_cents=4599,
+            items=[{"type": "product", "id": j, "name": f"Cartridge {j}", "qty": 2, "unit_price_cents": 1299} for j in range(6)],
+            created_at=now - timedelta(days=i), updated_at=now,
+        )
+        for i in range(rows)
+    ]
+    return {"next": None, "previous": None, "results": OrderSerializer(orders, many=True).data}
+
+
+def case_detail(rows):
+    now = timezone.now()
+    user = User(id=1, phone="+37120000000")
+    case = PlumbingCase(id=1, user=user, title="Leak under sink", description="Drips overnight. " * 20, created_at=now, updated_at=now)
+    data = dict(PlumbingCaseSerializer(case).data)
+    messages = [CaseMessage(id=i, case=case, sender=user, message="Checked the valve, will replace tomorrow. " * 3, created_at=now) for i in range(rows)]
+    for m in messages:
+        # Stands in for prefetch_related("attachments"), which the views always do.
+        m._prefetched_objects_cache = {"attachments": [
+            CaseAttachment(
+                id=m.id, case=case, message=m, uploaded_by=user, file=f"case-attachments/1/{m.id}.jpg",
+                filename="valve.jpg", content_type="image/jpeg", size=482133,
+                thumbnail=f"case-attachments/1/thumb-{m.id}.jpg", thumbnail_status="done", created_at=now,
+            )
+        ] if m.id % 4 == 0 else []}
+    data["messages"] = CaseMessageSerializer(messages, many=True).data
+    return data
+
+
+def bench(label, fn, repeat):
+    seconds = min(timeit.repeat(fn, number=repeat, repeat=3)) / repeat
+    return f"{label:<10} {seconds * 1e6:>10.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    stock_r, fast_r = JSONRenderer(), ORJSONRenderer()
+    stock_p, fast_p = JSONParser(), ORJSONParser()
+    for name, build in (("products", product_list), ("orders", order_history), ("case", case_detail)):
+        payload = build(args.rows)
+        body = stock_r.render(payload)
+        assert fast_p.parse(BytesIO(fast_r.render(payload))) == stock_p.parse(BytesIO(body))
+        print(f"{name}: {len(body) / 1024:.1f} KiB")
+        print("  render " + bench("stock", lambda: stock_r.render(payload), args.repeat))
+        print("  render " + bench("orjson", lambda: fast_r.render(payload), args.repeat))
+        print("  parse  " + bench("stock", lambda: stock_p.parse(BytesIO(body)), args.repeat))
+        print("  parse  " + bench("orjson", lambda: fast_p.parse(BytesIO(body)), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
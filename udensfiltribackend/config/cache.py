@@ -0,0 +1,144 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .conditional import make_etag, not_modified, set_validators
+
+
+GENERATION_KEY = "generation:%s"
+RESPONSE_KEY = "response:%s:%s:%s"
+
+
+def _label(model) -> str:
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _seed() -> int:
+    # Counters start from the clock so an evicted counter never reuses a
+    # generation that stale responses may still be stored under.
+    return int(time.time() * 1000)
+
+
+def get_generations(*models) -> tuple:
+    """Current generation counter of each model, in the order given."""
+    keys = [GENERATION_KEY % _label(m) for m in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _seed(), timeout=None)
+            found[key] = cache.get(key)
+    return tuple(found[k] for k in keys)
+
+
+def get_generation(model) -> int:
+    return get_generations(model)[0]
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _seed(), timeout=None)
+
+
+def bump_generation(*models) -> None:
+    """Invalidate every cached payload that depends on the given models.
+
+    The bump is deferred until the current transaction commits so a concurrent
+    reader cannot cache pre-commit rows under the new generation.
+    """
+    keys = [GENERATION_KEY % _label(m) for m in models]
+    transaction.on_commit(lambda: _bump(keys))
+
+
+class CachedResponseMixin:
+    """Serve list/retrieve payloads from the cache, keyed by model generations.
+
+    Views declare the models their payload is built from in ``cache_models``;
+    any save/delete signal or explicit ``bump_generation`` on one of them moves
+    the key so stale entries simply stop being read. The key doubles as the
+    ETag, so revalidation is answered with a 304 before the cache is touched.
+
+    Only query parameters the view understands are part of the key, sorted;
+    a request carrying any other one is served uncached, so arbitrary query
+    strings cannot fill the cache with copies of the same payload.
+    """
+
+    cache_models = ()
+    cache_timeout = None
+    # Extra query parameters the payload depends on, beyond those of the
+    # paginator, the filter backends and sparse fieldsets.
+    cache_query_params = ()
+
+    def get_cache_variant(self, request) -> str:
+        return ""
+
+    def get_cache_query_params(self) -> set:
+        params = {*self.cache_query_params, *getattr(self, "fieldset_query_params", ())}
+        if api_settings.URL_FORMAT_OVERRIDE:
+            params.add(api_settings.URL_FORMAT_OVERRIDE)
+        paginator = self.paginator
+        for attr in ("cursor_query_param", "page_query_param", "page_size_query_param", "limit_query_param", "offset_query_param"):
+            if getattr(paginator, attr, None):
+                params.add(getattr(paginator, attr))
+        for backend in self.filter_backends:
+            params.update(getattr(backend, "query_params", ()))
+            for attr in ("search_param", "ordering_param"):
+                if getattr(backend, attr, None):
+                    params.add(getattr(backend, attr))
+        return params
+
+    def get_response_cache_key(self, request):
+        if request.method != "GET" or not self.cache_models:
+            return None
+        known = self.get_cache_query_params()
+        if not known.issuperset(request.query_params):
+            return None
+        query = urlencode(sorted((k, v) for k in request.query_params for v in request.query_params.getlist(k)))
+        generations = ".".join(str(g) for g in get_generations(*self.cache_models))
+        # Absolute URL: paginated payloads embed absolute next/previous links.
+        path = hashlib.md5(f"{request.build_absolute_uri(request.path)}?{query}".encode()).hexdigest()
+        prefix = f"{self.basename}.{self.action}"
+        variant = self.get_cache_variant(request)
+        if variant:
+            prefix = f"{prefix}.{variant}"
+        return RESPONSE_KEY % (prefix, generations, path)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        etag = make_etag(key)
+        response = not_modified(request, etag=etag)
+        if response is not None:
+            return response
+        timeout = self.cache_timeout if self.cache_timeout is not None else settings.API_CACHE_TIMEOUT
+        data = cache.get(key)
+        if data is not None:
+            response = set_validators(Response(data), etag)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, timeout)
+            set_validators(response, etag)
+        # Lets CompressionMiddleware reuse the compressed body for this payload.
+        # Only the JSON rendering is identical for every user; the browsable API
+        # HTML embeds the user and a CSRF token, so it is compressed per request.
+        if getattr(request, "accepted_media_type", "").split(";")[0].strip() == "application/json":
+            response.compression_cache_key = key
+            response.compression_cache_timeout = timeout
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
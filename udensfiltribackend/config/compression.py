@@ -0,0 +1,92 @@
+import gzip
+
+import brotli
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+
+COMPRESSED_KEY = "compressed:%s:%s"
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "application/rss+xml", "application/atom+xml")
+
+
+def _compress_brotli(content: bytes) -> bytes:
+    # Quality 5 is the usual sweet spot for on-the-fly compression; 11 is for static files.
+    return brotli.compress(content, quality=5)
+
+
+def _compress_gzip(content: bytes) -> bytes:
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+CODECS = {"br": _compress_brotli, "gzip": _compress_gzip}
+
+
+def choose_encoding(accept_encoding: str):
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header, honouring q-values."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    best = None
+    for coding in CODECS:  # dict order is the tie-break: br before gzip
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (coding, q)
+    return best[0] if best else None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Brotli/gzip for GET responses above ``COMPRESSION_MIN_SIZE`` bytes.
+
+    Streaming bodies, non-text media and responses that already carry a
+    Content-Encoding are left alone. JSON responses served by
+    ``CachedResponseMixin`` carry ``compression_cache_key`` (the payload's
+    generation-based cache key), so their compressed bytes are stored once and
+    reused by every later hit; other renderings (the browsable API's HTML
+    embeds the user) are compressed per request.
+    Only GET/HEAD responses are compressed, so request bodies an attacker
+    controls are never compressed next to per-user data (BREACH).
+    """
+
+    def process_response(self, request, response):
+        if request.method not in ("GET", "HEAD") or response.streaming or response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.endswith("+json"):
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        cache_key = getattr(response, "compression_cache_key", None) if content_type == "application/json" else None
+        compressed = None
+        if cache_key:
+            cache_key = COMPRESSED_KEY % (f"{encoding}.{content_type}", cache_key)
+            compressed = cache.get(cache_key)
+        if compressed is None:
+            compressed = CODECS[encoding](response.content)
+            if cache_key:
+                cache.set(cache_key, compressed, getattr(response, "compression_cache_timeout", None))
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,32 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.md5(":".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag:
+        response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """Return a 304 response if the request's validators still match, else None.
+
+    Call this before loading or serializing the payload; the validators should
+    come from something cheap such as ``updated_at`` or a generation counter.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    if get_conditional_response(request, etag=etag, last_modified=timestamp) is None:
+        return None
+    return set_validators(Response(status=304), etag, last_modified)
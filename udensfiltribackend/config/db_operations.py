@@ -0,0 +1,77 @@
+from django.contrib.postgres.indexes import PostgresIndex
+from django.contrib.postgres.operations import CreateExtension
+from django.db import migrations
+
+
+def _extension_installed(schema_editor, name) -> bool:
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = %s", [name])
+        return bool(cursor.fetchone())
+
+
+class CreateExtensionIfAvailable(CreateExtension):
+    """CREATE EXTENSION that is skipped when the server does not ship it.
+
+    Indexes that depend on the extension should be added with
+    ``PostgresAddIndex(..., extension=name)`` so they are skipped as well.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = %s", [self.name])
+                if not cursor.fetchone():
+                    return
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgresAddIndex(migrations.AddIndex):
+    """AddIndex for PostgreSQL-only index types (GIN, trigram, ...).
+
+    The index stays in the migration state everywhere, but the DDL only runs on
+    PostgreSQL (and, when ``extension`` is given, only once that extension is
+    installed) so the optional SQLite development setup keeps migrating.
+    """
+
+    def __init__(self, model_name, index, extension=None):
+        super().__init__(model_name, index)
+        self.extension = extension
+
+    def _applies(self, schema_editor) -> bool:
+        if schema_editor.connection.vendor != "postgresql":
+            return False
+        return self.extension is None or _extension_installed(schema_editor, self.extension)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if self._applies(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if self._applies(schema_editor):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if self.extension:
+            kwargs["extension"] = self.extension
+        return name, args, kwargs
+
+
+class PortableAddField(migrations.AddField):
+    """AddField for models that carry ``PostgresAddIndex`` indexes.
+
+    SQLite adds most columns by rebuilding the table, and the rebuild recreates
+    every index in the model state, PostgreSQL-only ones included. Those are
+    left out of the rebuild there, matching what ``PostgresAddIndex`` created.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        indexes = model._meta.indexes
+        model._meta.indexes = [index for index in indexes if not isinstance(index, PostgresIndex)]
+        try:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        finally:
+            model._meta.indexes = indexes
@@ -0,0 +1,70 @@
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+# Fields whose to_representation() is the identity for the values the
+# database driver already returns; everything else is converted per value.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def values_plan(serializer):
+    """Map a serializer's readable fields to ``values()`` columns.
+
+    Returns ``[(name, column, convert)]`` or None when a field needs a model
+    instance (nested serializers, method fields, dotted or ``*`` sources).
+    """
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField, serializers.ManyRelatedField)):
+            return None
+        if field.source == "*" or "." in field.source:
+            return None
+        convert = None if isinstance(field, PASSTHROUGH_FIELDS) else field.to_representation
+        plan.append((name, field.source, convert))
+    return plan
+
+
+def values_queryset(queryset, plan):
+    """``values()`` over the plan's columns plus the ordering columns cursor pagination reads."""
+    ordering = tuple(queryset.query.order_by) or tuple(queryset.model._meta.ordering)
+    columns = [column for _, column, _ in plan]
+    columns += [o.lstrip("-") for o in ordering if isinstance(o, str)]
+    return queryset.values(*dict.fromkeys(columns))
+
+
+def serialize_values(rows, plan) -> list:
+    """Build the same dicts the serializer would, straight from ``values()`` rows."""
+    data = []
+    for row in rows:
+        item = {}
+        for name, column, convert in plan:
+            value = row[column]
+            item[name] = value if convert is None or value is None else convert(value)
+        data.append(item)
+    return data
+
+
+class ValuesListMixin:
+    """Serve ``list`` from ``values()`` rows, skipping model instances and ModelSerializer.
+
+    The output is built from the view's own serializer fields, so sparse
+    fieldsets and later field changes carry over; serializers the plan cannot
+    express fall back to the regular ``list``.
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = values_plan(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = values_queryset(self.filter_queryset(self.get_queryset()), plan)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_values(page, plan))
+        return Response(serialize_values(queryset, plan))
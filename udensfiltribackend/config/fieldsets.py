@@ -0,0 +1,59 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _names(request, param):
+    raw = request.query_params.get(param, "")
+    return [name for name in (part.strip() for part in raw.split(",")) if name]
+
+
+class SparseFieldsetSerializerMixin:
+    """Let read requests pick the payload with ``?fields=a,b`` or ``?omit=c``.
+
+    Only the top-level serializer of a GET/HEAD request is trimmed; writes and
+    nested serializers always see their full field set. Dropped fields are kept
+    in ``dropped_fields`` so the view can leave their columns out of the query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dropped_fields = {}
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD"):
+            return
+        keep, omit = _names(request, "fields"), _names(request, "omit")
+        if not keep and not omit:
+            return
+        unknown = sorted(set(keep + omit) - set(self.fields))
+        if unknown:
+            raise serializers.ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}"]})
+        for name in list(self.fields):
+            if (keep and name not in keep) or name in omit:
+                self.dropped_fields[name] = self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """Defer the columns behind fields a ``SparseFieldsetSerializerMixin`` dropped.
+
+    Hooks ``filter_queryset`` (used by both list and ``get_object``) so views
+    remain free to override ``get_queryset``.
+    """
+
+    fieldset_query_params = ("fields", "omit")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in ("GET", "HEAD"):
+            return queryset
+        serializer = self.get_serializer()
+        model = queryset.model
+        deferred = []
+        for field in getattr(serializer, "dropped_fields", {}).values():
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            # Relations may be traversed by select_related(), which cannot be deferred.
+            if model_field.concrete and not model_field.is_relation and not model_field.primary_key:
+                deferred.append(model_field.name)
+        return queryset.defer(*deferred) if deferred else queryset
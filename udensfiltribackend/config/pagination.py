@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination that follows the ordering the view already applies.
+
+    DRF positions the cursor on the leading ordering column only: pages are
+    fetched with ``WHERE <column> < %s`` plus an ``OFFSET`` that skips rows
+    sharing the cursor's value. Deep pages stay cheap while that column is
+    close to unique (timestamps, ids); a long run of equal values degrades to an
+    offset scan over the run. End the ordering with a unique column (e.g.
+    ``order_by("name", "id")``) so rows inside such a run keep a stable order,
+    or the OFFSET may repeat or skip them. No ``COUNT(*)`` is ever issued.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-pk"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(queryset.query.order_by) or tuple(queryset.model._meta.ordering)
+        if ordering:
+            return ordering
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,22 @@
+import orjson
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(parsers.JSONParser):
+    """``JSONParser`` backed by orjson; NaN/Infinity are rejected like ``STRICT_JSON``."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            body = body.decode(encoding)
+        try:
+            return orjson.loads(body)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
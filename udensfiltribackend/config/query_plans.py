@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def explain(sql: str) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN " + sql)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+class QueryPlanAssertions:
+    """TestCase mixin that EXPLAINs every SELECT a block runs (PostgreSQL only).
+
+    Seed enough rows that a sequential scan is a real choice, ``analyze()`` the
+    tables, then wrap the request in ``assertNoSeqScan(Model, ...)``.
+    """
+
+    @staticmethod
+    def analyze(*models):
+        with connection.cursor() as cursor:
+            for model in models:
+                cursor.execute("ANALYZE %s" % connection.ops.quote_name(model._meta.db_table))
+
+    @contextmanager
+    def assertNoSeqScan(self, *models):
+        tables = [model._meta.db_table for model in models]
+        with CaptureQueriesContext(connection) as ctx:
+            yield
+        checked = 0
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT") or not any(t in sql for t in tables):
+                continue
+            plan = explain(sql)
+            checked += 1
+            for table in tables:
+                self.assertNotIn(f"Seq Scan on {table}", plan, f"{sql}\n\n{plan}")
+        self.assertTrue(checked, "no query touched %s" % ", ".join(tables))
@@ -0,0 +1,33 @@
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """``JSONRenderer`` backed by orjson.
+
+    orjson encodes dicts, lists, str subclasses (``ErrorDetail``, ``ReturnDict``)
+    and datetimes in C; anything else (Decimal, lazy strings, querysets, ...)
+    goes through DRF's own encoder, so API payloads match the stock renderer.
+    Floats are the exception: large exponents are written ``1e16`` rather than
+    ``1e+16``, and NaN/Infinity become ``null`` where the stock renderer raises.
+    Pretty-printed requests (``indent=``, browsable API) and anything orjson
+    cannot encode (e.g. integers wider than 64 bits) use the stock renderer.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-subset escaping as the stock renderer.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,42 @@
+from functools import reduce
+from operator import add, or_
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections
+
+
+def search_configs(lang=None) -> list:
+    """Text search configurations to use, for one language or all of them."""
+    configs = settings.SEARCH_CONFIGS
+    if lang:
+        return [configs[lang]]
+    return list(dict.fromkeys(configs.values()))
+
+
+def build_search_vector(weighted_fields):
+    """One tsvector holding every field, weighted, under every configured language."""
+    return reduce(add, [
+        SearchVector(field, weight=weight, config=config)
+        for config in search_configs()
+        for field, weight in weighted_fields
+    ])
+
+
+def build_search_query(text: str, lang=None):
+    return reduce(or_, [SearchQuery(text, config=config, search_type="websearch") for config in search_configs(lang)])
+
+
+def update_search_vector(queryset, weighted_fields) -> int:
+    """Recompute ``search_vector`` for the rows in ``queryset`` inside the database."""
+    if connections[queryset.db].vendor != "postgresql":
+        return 0
+    return queryset.update(search_vector=build_search_vector(weighted_fields))
+
+
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    """post_save receiver for models declaring ``SEARCH_FIELDS``."""
+    fields = {field for field, _ in sender.SEARCH_FIELDS}
+    if update_fields is not None and not fields.intersection(update_fields):
+        return
+    update_search_vector(sender._default_manager.filter(pk=instance.pk), sender.SEARCH_FIELDS)
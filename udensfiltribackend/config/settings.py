@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     "rest_framework",
     "rest_framework_simplejwt.token_blacklist",
@@ -46,11 +47,15 @@ INSTALLED_APPS = [
     "apps.cases",
     "apps.orders",
     "apps.blog",
+    "apps.search",
+    "apps.snapshots",
+    "apps.seo",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "config.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -95,6 +100,20 @@ else:
         }
     }
 
+REDIS_URL = env("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+else:
+    # Per-process cache: fine for development, but generation bumps are not
+    # shared between gunicorn workers, so set REDIS_URL in production.
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Read API payloads are keyed by model generation, so this only bounds memory use.
+API_CACHE_TIMEOUT = int(env("API_CACHE_TIMEOUT", "86400"))
+
+# Responses smaller than this are not worth compressing.
+COMPRESSION_MIN_SIZE = int(env("COMPRESSION_MIN_SIZE", "1024"))
+
 AUTH_USER_MODEL = "accounts.User"
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -112,6 +131,44 @@ USE_TZ = True
 STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Lower bounds (in cents) of the price buckets reported by the catalog facets endpoints.
+CATALOG_PRICE_BUCKETS = [int(b) for b in env("CATALOG_PRICE_BUCKETS", "0,1000,2500,5000,10000,25000").split(",")]
+
+# Pre-compressed catalog/blog snapshots (build_snapshot), served by nginx or a CDN under SNAPSHOT_URL.
+SNAPSHOT_ROOT = env("SNAPSHOT_ROOT", str(BASE_DIR / "snapshots"))
+SNAPSHOT_URL = env("SNAPSHOT_URL", "/snapshots/")
+SNAPSHOT_KEEP = int(env("SNAPSHOT_KEEP", "3"))
+
+# "postgres" fans new case messages out through LISTEN/NOTIFY so every worker
+# process sees them; "local" only reaches streams in the saving process.
+CASE_EVENTS_BACKEND = env("CASE_EVENTS_BACKEND", "local" if DB_ENGINE == "django.db.backends.sqlite3" else "postgres")
+CASE_EVENTS_HEARTBEAT = int(env("CASE_EVENTS_HEARTBEAT", "15"))
+CASE_EVENTS_RETRY_MS = 3000
+
+# Chunked case attachment uploads (apps.cases.uploads); thumbnails come from process_attachments.
+ATTACHMENT_MAX_SIZE = int(env("ATTACHMENT_MAX_SIZE", str(500 * 1024 * 1024)))
+ATTACHMENT_CHUNK_SIZE = int(env("ATTACHMENT_CHUNK_SIZE", str(5 * 1024 * 1024)))
+ATTACHMENT_CHUNK_MAX = int(env("ATTACHMENT_CHUNK_MAX", str(16 * 1024 * 1024)))
+ATTACHMENT_CONTENT_TYPES = ("image/", "video/", "application/pdf")
+ATTACHMENT_THUMBNAIL_SIZE = int(env("ATTACHMENT_THUMBNAIL_SIZE", "400"))
+ATTACHMENT_UPLOAD_TTL_HOURS = int(env("ATTACHMENT_UPLOAD_TTL_HOURS", "24"))
+# Private: never publicly served. Files go out through the authenticated download
+# view, which hands them to nginx when ATTACHMENT_ACCEL_PREFIX names an internal
+# location aliased to ATTACHMENT_ROOT, and streams them itself otherwise.
+ATTACHMENT_ROOT = env("ATTACHMENT_ROOT", str(BASE_DIR / "attachments"))
+ATTACHMENT_ACCEL_PREFIX = env("ATTACHMENT_ACCEL_PREFIX", "")
+# Public origin of this API. Attachment URLs are built from it rather than from
+# the request, so REST responses and SSE events (built once per message, with no
+# request) carry the same absolute URLs.
+API_BASE_URL = env("API_BASE_URL", "http://localhost:8000")
+
+# Text search configuration per API language. PostgreSQL ships no Latvian stemmer,
+# so "lv" uses the unstemmed "simple" configuration unless a custom one is installed.
+SEARCH_CONFIGS = {
+    "lv": env("SEARCH_CONFIG_LV", "simple"),
+    "en": env("SEARCH_CONFIG_EN", "english"),
+}
+
 FRONTEND_ORIGIN = env("FRONTEND_ORIGIN", "http://localhost:3000")
 FRONTEND_ORIGINS = [o.strip() for o in env("FRONTEND_ORIGINS", FRONTEND_ORIGIN).split(",") if o.strip()]
 CORS_ALLOWED_ORIGINS = FRONTEND_ORIGINS
@@ -121,6 +178,17 @@ CSRF_TRUSTED_ORIGINS = [o for o in FRONTEND_ORIGINS if o.startswith("https://")
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("apps.accounts.auth.CookieJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticatedOrReadOnly",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.KeysetPagination",
+    "PAGE_SIZE": int(env("API_PAGE_SIZE", "50")),
     "DEFAULT_THROTTLE_RATES": {
         "code_ip": env("CODE_THROTTLE_IP", "10/min"),
         "code_email": env("CODE_THROTTLE_EMAIL", "3/min"),
@@ -144,6 +212,15 @@ AUTH_COOKIE_REFRESH_NAME = "refresh"
 STRIPE_SECRET_KEY = env("STRIPE_SECRET_KEY", "")
 STRIPE_WEBHOOK_SECRET = env("STRIPE_WEBHOOK_SECRET", "")
 FRONTEND_BASE_URL = env("FRONTEND_BASE_URL", "http://localhost:3000")
+# Frontend routes linked from the sitemap and feeds.
+FRONTEND_PATHS = {
+    "blog": "/blog",
+    "post": "/blog/{slug}",
+    "product": "/products/{slug}",
+    "service": "/services/{slug}",
+}
+BLOG_FEED_TITLE = env("BLOG_FEED_TITLE", "UdensFiltri blog")
+BLOG_FEED_ITEMS = int(env("BLOG_FEED_ITEMS", "50"))
 
 SENDGRID_API_KEY = env("SENDGRID_API_KEY", "")
 if SENDGRID_API_KEY:
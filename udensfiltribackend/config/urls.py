@@ -10,4 +10,7 @@ urlpatterns = [
     path("api/cases/", include("apps.cases.urls")),
     path("api/orders/", include("apps.orders.urls")),
     path("api/blog/", include("apps.blog.urls")),
+    path("api/search/", include("apps.search.urls")),
+    path("api/snapshot/", include("apps.snapshots.urls")),
+    path("", include("apps.seo.urls")),
 ]